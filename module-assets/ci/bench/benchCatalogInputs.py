@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import benchUtils
+import jsonSchemaValidator
+import terraformDocsUtils
+import validateIbmCatalogJson
+
+# benchmark of the catalog input checks of validateIbmCatalogJson (missing, extra and duplicated inputs and HCL editor).
+# A synthetic catalog with 'flavors' flavors sharing one solution is generated for every number of inputs, the time of
+# the input comparisons of all flavors must grow linearly with the number of inputs.
+#
+# Run from the 'ci' folder: python3 bench/benchCatalogInputs.py [--flavors 100] [--inputs 125 250 500 1000]
+
+DEFAULT_FLAVORS = 100
+DEFAULT_INPUTS = [125, 250, 500, 1000]
+SOLUTION_DIR = "solution"
+
+
+def get_input_type(i):
+    # every 10th input needs HCL editor
+    return "list(object({ name = string }))" if i % 10 == 0 else "string"
+
+
+# write solution with 'inputs' variables and ibm_catalog.json with 'flavors' flavors of the solution
+def create_catalog(path, flavors, inputs):
+    os.makedirs(os.path.join(path, SOLUTION_DIR))
+    with open(os.path.join(path, SOLUTION_DIR, "variables.tf"), "w") as f:
+        for i in range(inputs):
+            f.write(f'variable "input_{i}" {{\n  type = {get_input_type(i)}\n}}\n\n')
+
+    configuration = []
+    for i in range(inputs):
+        item = {"key": f"input_{i}"}
+        if i % 10 == 0:
+            item["custom_config"] = {
+                "type": "code_editor",
+                "config_constraints": {"supportedLanguages": ["hcl"]},
+            }
+        configuration.append(item)
+    ibm_catalog = {
+        "products": [
+            {
+                "label": "Benchmark",
+                "product_kind": "solution",
+                "flavors": [
+                    {
+                        "label": f"Flavor {i}",
+                        "working_directory": SOLUTION_DIR,
+                        "terraform_version": "1.9.0",
+                        "short_description": "Benchmark flavor",
+                        "configuration": configuration,
+                    }
+                    for i in range(flavors)
+                ],
+            }
+        ]
+    }
+    catalog_file = os.path.join(path, "ibm_catalog.json")
+    with open(catalog_file, "w") as f:
+        f.write(json.dumps(ibm_catalog, indent=2) + "\n")
+    return catalog_file
+
+
+# return seconds spent in the input comparisons of all flavors (input extraction and schema validation excluded)
+def run_checks(catalog_file, schema):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = validateIbmCatalogJson.check_ibm_catalog_file(
+            catalog_file, "bench", executor, schema, "native", check_format=True
+        )
+    if validateIbmCatalogJson.has_errors(result):
+        print(validateIbmCatalogJson.render_text([result]))
+        sys.exit(1)
+    return sum(x["comparison_seconds"] for x in result["flavors"])
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(description="Benchmark catalog input checks")
+    parser.add_argument("--flavors", type=int, default=DEFAULT_FLAVORS)
+    parser.add_argument("--inputs", type=int, nargs="+", default=DEFAULT_INPUTS)
+    parser.add_argument("--max-ratio", type=float, default=benchUtils.DEFAULT_MAX_RATIO)
+    return parser
+
+
+def main(flavors, inputs, max_ratio):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ[terraformDocsUtils.CACHE_DIR_ENV] = temp_dir
+        schema = jsonSchemaValidator.prepare_schema(
+            jsonSchemaValidator.load_compiled_schema(validateIbmCatalogJson.SCHEMA_FILE)
+        )
+        rows = []
+        for count in sorted(inputs):
+            catalog_file = create_catalog(
+                os.path.join(temp_dir, str(count)), flavors, count
+            )
+            rows.append(
+                (count, min(run_checks(catalog_file, schema) for _ in range(3)))
+            )
+    passed = benchUtils.report_scaling(
+        f"input comparisons of {flavors} flavors", "input", rows, max_ratio
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    args = initialize_parser().parse_args()
+    main(args.flavors, args.inputs, args.max_ratio)
@@ -0,0 +1,79 @@
+import argparse
+import functools
+import os
+import sys
+import tempfile
+
+import benchUtils
+import terraformDocOverview
+import terraformDocsIndex
+
+# benchmark of terraformDocOverview.get_headings on a synthetic tree. Solutions have vendored '.terraform' folders
+# with most of the files of the tree, the time of indexing the repository and getting the headings of the
+# solutions must not grow with the number of files in these folders.
+#
+# Run from the 'ci' folder: python3 bench/benchOverviewHeadings.py [--solutions 10] [--files 1000 10000 100000]
+
+DEFAULT_SOLUTIONS = 10
+DEFAULT_FILES = [1000, 10000, 100000]
+FOLDER_NAME = "Deployable Architectures"
+
+
+# create repository with 'solutions' solutions and 'files' files in their '.terraform' folders
+def create_repository(path, solutions, files):
+    for i in range(solutions):
+        solution_dir = os.path.join(path, "solutions", f"solution-{i}")
+        os.makedirs(solution_dir)
+        with open(os.path.join(solution_dir, "main.tf"), "w") as f:
+            f.write('variable "name" {}\n')
+        with open(os.path.join(solution_dir, "README.md"), "w") as f:
+            f.write(f"# Solution {i}\n")
+        modules_dir = os.path.join(solution_dir, ".terraform", "modules")
+        os.makedirs(modules_dir)
+        for j in range(files // solutions):
+            if j % 100 == 0:
+                # vendored modules have README files too
+                chunk_dir = os.path.join(modules_dir, f"module-{j // 100}")
+                os.makedirs(chunk_dir)
+                open(os.path.join(chunk_dir, "README.md"), "w").close()
+                open(os.path.join(chunk_dir, "main.tf"), "w").close()
+            open(os.path.join(chunk_dir, f"file-{j}.tf"), "w").close()
+
+
+def get_headings(path):
+    index = terraformDocsIndex.RepositoryIndex(path)
+    return terraformDocOverview.get_headings(
+        FOLDER_NAME, "https://github.com/bench/bench", "bench", index
+    )
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(description="Benchmark overview headings")
+    parser.add_argument("--solutions", type=int, default=DEFAULT_SOLUTIONS)
+    parser.add_argument("--files", type=int, nargs="+", default=DEFAULT_FILES)
+    parser.add_argument("--max-ratio", type=float, default=benchUtils.DEFAULT_MAX_RATIO)
+    return parser
+
+
+def main(solutions, files, max_ratio):
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for count in sorted(files):
+            path = os.path.join(temp_dir, str(count))
+            create_repository(path, solutions, count)
+            headings = get_headings(path)
+            if len(headings) != solutions:
+                print(f"Error: {len(headings)} headings found, expected {solutions}")
+                sys.exit(1)
+            rows.append(
+                (count, benchUtils.best_time(functools.partial(get_headings, path)))
+            )
+    passed = benchUtils.report_flat(
+        f"index and headings of {solutions} solutions", "files", "run", rows, max_ratio
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    args = initialize_parser().parse_args()
+    main(args.solutions, args.files, args.max_ratio)
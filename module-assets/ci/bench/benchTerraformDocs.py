@@ -0,0 +1,101 @@
+import argparse
+import os
+import stat
+import sys
+import tempfile
+
+import benchUtils
+import terraformDocs
+import terraformDocsUtils
+
+# benchmark of terraformDocs per module cost as the repository grows. A synthetic repository with 'modules' modules
+# is generated for every tree size, files are added to the '.terraform' folders of the modules (provider caches).
+# The time of updating one README must not grow with the number of files in the tree.
+#
+# terraform-docs is replaced with a shell script printing fixed content, so only the cost of the hook itself is
+# measured (terraform-docs run time does not depend on the size of the tree).
+#
+# Run from the 'ci' folder: python3 bench/benchTerraformDocs.py [--modules 10] [--files 1000 10000 100000]
+
+DEFAULT_MODULES = 10
+DEFAULT_FILES = [1000, 10000, 100000]
+TERRAFORM_DOCS_SCRIPT = """#!/bin/sh
+if [ "$1" = "--version" ]; then
+  echo "terraform-docs version v0.0.0-bench"
+  exit 0
+fi
+printf '<!-- BEGIN_TF_DOCS -->\\n## Requirements\\n\\nNo requirements.\\n<!-- END_TF_DOCS -->\\n'
+"""
+README = f"""# Module
+
+{terraformDocs.HOOK_BEGIN}
+{terraformDocs.HOOK_END}
+"""
+
+
+def create_terraform_docs(bin_dir):
+    os.makedirs(bin_dir)
+    script = os.path.join(bin_dir, "terraform-docs")
+    with open(script, "w") as f:
+        f.write(TERRAFORM_DOCS_SCRIPT)
+    os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+
+
+# create repository with 'modules' modules and 'files' files in their '.terraform' folders
+def create_repository(path, modules, files):
+    for i in range(modules):
+        module_dir = os.path.join(path, "modules", f"module-{i}")
+        os.makedirs(module_dir)
+        with open(os.path.join(module_dir, "main.tf"), "w") as f:
+            f.write('variable "name" {}\n')
+        with open(os.path.join(module_dir, "README.md"), "w") as f:
+            f.write(README)
+        cache_dir = os.path.join(module_dir, ".terraform", "providers")
+        os.makedirs(cache_dir)
+        for j in range(files // modules):
+            if j % 1000 == 0:
+                chunk_dir = os.path.join(cache_dir, f"chunk-{j // 1000}")
+                os.makedirs(chunk_dir)
+            open(os.path.join(chunk_dir, f"file-{j}"), "w").close()
+
+
+# return seconds per updated module of terraformDocs run in 'path' (every README is updated)
+def run_terraform_docs(path, modules):
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        seconds = benchUtils.best_time(lambda: terraformDocs.main(jobs=1, force=True))
+    finally:
+        os.chdir(cwd)
+    return seconds / modules
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(description="Benchmark terraformDocs")
+    parser.add_argument("--modules", type=int, default=DEFAULT_MODULES)
+    parser.add_argument("--files", type=int, nargs="+", default=DEFAULT_FILES)
+    parser.add_argument("--max-ratio", type=float, default=benchUtils.DEFAULT_MAX_RATIO)
+    return parser
+
+
+def main(modules, files, max_ratio):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ[terraformDocsUtils.CACHE_DIR_ENV] = os.path.join(temp_dir, "cache")
+        bin_dir = os.path.join(temp_dir, "bin")
+        create_terraform_docs(bin_dir)
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+
+        rows = []
+        for count in sorted(files):
+            path = os.path.join(temp_dir, str(count))
+            create_repository(path, modules, count)
+            rows.append((count, run_terraform_docs(path, modules)))
+    passed = benchUtils.report_flat(
+        f"terraformDocs with {modules} modules", "files", "module", rows, max_ratio
+    )
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    args = initialize_parser().parse_args()
+    main(args.modules, args.files, args.max_ratio)
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+# benchmarks are run as scripts ('python3 bench/<benchmark>.py' from the 'ci' folder), hook scripts are imported
+# by module name, so the 'ci' folder is added to the import path when this module is imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# cost per unit of the largest size may be at most this many times the cost per unit of the smallest size
+DEFAULT_MAX_RATIO = 3.0
+
+
+# return the best wall time in seconds of 'repeat' runs of 'func'
+def best_time(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# print table of (size, seconds) and check that cost grows at most linearly with size (cost per unit is flat).
+# Return True if the check passed.
+def report_scaling(title, unit, rows, max_ratio=DEFAULT_MAX_RATIO):
+    print(title)
+    print(f"{unit:>12} {'seconds':>12} {'us/' + unit:>14}")
+    for size, seconds in rows:
+        print(f"{size:>12} {seconds:>12.4f} {seconds / size * 1e6:>14.3f}")
+    first_size, first_seconds = rows[0]
+    last_size, last_seconds = rows[-1]
+    ratio = (last_seconds / last_size) / (first_seconds / first_size)
+    passed = ratio <= max_ratio
+    print(
+        f"cost per {unit} grew {ratio:.2f}x from {first_size} to {last_size} "
+        f"(limit {max_ratio}x): {'OK' if passed else 'FAILED'}\n"
+    )
+    return passed
+
+
+# print table of (size, seconds per item) and check that the cost per item does not grow with size.
+# Return True if the check passed.
+def report_flat(title, unit, item, rows, max_ratio=DEFAULT_MAX_RATIO):
+    print(title)
+    print(f"{unit:>12} {'ms/' + item:>14}")
+    for size, seconds in rows:
+        print(f"{size:>12} {seconds * 1e3:>14.3f}")
+    ratio = rows[-1][1] / rows[0][1]
+    passed = ratio <= max_ratio
+    print(
+        f"cost per {item} grew {ratio:.2f}x from {rows[0][0]} to {rows[-1][0]} {unit} "
+        f"(limit {max_ratio}x): {'OK' if passed else 'FAILED'}\n"
+    )
+    return passed
@@ -0,0 +1,46 @@
+#!/usr/bin/python
+
+import argparse
+
+import terraformDocExamples
+import terraformDocGoMod
+import terraformDocOverview
+import terraformDocs
+import terraformDocsIndex
+import terraformDocsUtils
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(
+        description="Add examples, terraform docs and overview sections to README files and module repository to go.mod"
+    )
+    terraformDocsUtils.add_jobs_argument(
+        parser, "README files updated by terraform docs"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        dest="force",
+        help="Update terraform docs of all README files, even if their modules did not change since the last run",
+        default=False,
+    )
+    return parser
+
+
+# run all doc generators in one process over a single repository index, in the same order as the pre-commit hooks
+def main():
+    args = initialize_parser().parse_args()
+    index = terraformDocsIndex.RepositoryIndex(
+        markers=[
+            terraformDocExamples.HOOK_TAG,
+            terraformDocs.HOOK_BEGIN,
+        ]
+    )
+    terraformDocExamples.main(index)
+    terraformDocs.main(index, args.jobs, args.force)
+    terraformDocGoMod.main()
+    terraformDocOverview.main(index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+import re
+
+import terraformDocsUtils
+
+# JSON Schema (draft-07 subset) validator. A schema is compiled into a flat list of rules, every rule is a
+# single keyword check (e.g. 'required') applied to all nodes matching a path like ['products', '*', 'flavors'],
+# where '*' matches every item of an array. 'if' / 'then' / 'else' are compiled into guards of the rules.
+# The compiled schema is plain JSON, so it is cached on disk and the schema is compiled only when it changes.
+#
+# Supported keywords: $ref (local '#/definitions/...'), type, required, properties, items, enum, const,
+# pattern, minLength, if, then, else. 'errorMessage' replaces the default message of failing checks, it is either a
+# message of all checks or an object with messages of single keywords (e.g. {"pattern": "..."}). '${0}' in the
+# message is replaced by the checked value (same as ajv-errors).
+
+COMPILER_VERSION = "2"
+VALUE_TEMPLATE = "${0}"
+CACHE_NAME = "json-schema"
+CHECK_KEYWORDS = ["type", "required", "enum", "const", "pattern", "minLength"]
+MAX_DEPTH = 32
+TYPES = {
+    "object": lambda x: isinstance(x, dict),
+    "array": lambda x: isinstance(x, list),
+    "string": lambda x: isinstance(x, str),
+    "boolean": lambda x: isinstance(x, bool),
+    "null": lambda x: x is None,
+    "number": lambda x: isinstance(x, (int, float)) and not isinstance(x, bool),
+    "integer": lambda x: isinstance(x, int) and not isinstance(x, bool),
+}
+
+
+class SchemaError(Exception):
+    pass
+
+
+def resolve_ref(root_schema, ref):
+    if not ref.startswith("#/"):
+        raise SchemaError(f"only local references are supported: {ref}")
+    schema = root_schema
+    for segment in ref[2:].split("/"):
+        schema = schema[segment.replace("~1", "/").replace("~0", "~")]
+    return schema
+
+
+def compile_rules(root_schema, schema, path, guards, rules, depth=0):
+    if depth > MAX_DEPTH:
+        raise SchemaError("schema is too deep (recursive schemas are not supported)")
+    if "$ref" in schema:
+        schema = resolve_ref(root_schema, schema["$ref"])
+
+    for keyword in CHECK_KEYWORDS:
+        if keyword in schema:
+            rule = {"path": path, "guards": guards, "keyword": keyword}
+            rule["value"] = schema[keyword]
+            message = schema.get("errorMessage")
+            if isinstance(message, dict):
+                message = message.get(keyword)
+            if message:
+                rule["message"] = message
+            rules.append(rule)
+
+    for name, subschema in schema.get("properties", {}).items():
+        compile_rules(root_schema, subschema, path + [name], guards, rules, depth + 1)
+    if "items" in schema:
+        items = schema["items"]
+        compile_rules(root_schema, items, path + ["*"], guards, rules, depth + 1)
+
+    if "if" in schema:
+        # condition rules are relative to the node where 'if' is defined
+        condition = []
+        compile_rules(root_schema, schema["if"], [], [], condition, depth + 1)
+        for branch, negate in (("then", False), ("else", True)):
+            if branch in schema:
+                guard = {"depth": len(path), "rules": condition, "negate": negate}
+                compile_rules(
+                    root_schema,
+                    schema[branch],
+                    path,
+                    guards + [guard],
+                    rules,
+                    depth + 1,
+                )
+
+
+def compile_schema(schema):
+    rules = []
+    compile_rules(schema, schema, [], [], rules)
+    return {"version": COMPILER_VERSION, "rules": rules}
+
+
+# check shape of compiled rules (and rules of their guards)
+def is_valid_rules(rules):
+    return isinstance(rules, list) and all(
+        isinstance(rule, dict)
+        and isinstance(rule.get("path"), list)
+        and rule.get("keyword") in CHECK_KEYWORDS
+        and "value" in rule
+        and isinstance(rule.get("guards"), list)
+        and all(
+            isinstance(guard, dict)
+            and isinstance(guard.get("depth"), int)
+            and isinstance(guard.get("negate"), bool)
+            and is_valid_rules(guard.get("rules"))
+            for guard in rule["guards"]
+        )
+        for rule in rules
+    )
+
+
+def is_valid_compiled_schema(compiled_schema):
+    return (
+        isinstance(compiled_schema, dict)
+        and compiled_schema.get("version") == COMPILER_VERSION
+        and is_valid_rules(compiled_schema.get("rules"))
+    )
+
+
+# load compiled schema from the cache or compile it (and cache it) if the schema file changed.
+# Cached schema of another shape or compiler version (e.g. edited by hand) is compiled again.
+def load_compiled_schema(schema_file):
+    with open(schema_file, "rb") as f:
+        content = f.read()
+    key = hashlib.sha256(COMPILER_VERSION.encode("utf-8") + content).hexdigest()
+
+    cache_file = None
+    try:
+        cache_file = os.path.join(
+            terraformDocsUtils.get_cache_dir(CACHE_NAME), f"{key}.json"
+        )
+        with open(cache_file) as f:
+            compiled_schema = json.load(f)
+        if is_valid_compiled_schema(compiled_schema):
+            return compiled_schema
+    except (OSError, ValueError):
+        pass
+
+    compiled_schema = compile_schema(json.loads(content))
+    if cache_file:
+        try:
+            terraformDocsUtils.write_json(cache_file, compiled_schema)
+        except OSError:
+            pass
+    return compiled_schema
+
+
+def escape_pointer_segment(segment):
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+# return all nodes matching 'path' as (pointer segments, parent nodes including the node itself)
+def resolve_nodes(document, path):
+    nodes = [([], [document])]
+    for segment in path:
+        matches = []
+        for pointer, parents in nodes:
+            node = parents[-1]
+            if segment == "*":
+                if isinstance(node, list):
+                    for index, item in enumerate(node):
+                        matches.append((pointer + [index], parents + [item]))
+            elif isinstance(node, dict) and segment in node:
+                matches.append((pointer + [segment], parents + [node[segment]]))
+        nodes = matches
+    return nodes
+
+
+# message of a failing check, 'errorMessage' of the rule if it is defined
+def get_message(rule, value, message):
+    if "message" not in rule:
+        return message
+    value = value if isinstance(value, str) else json.dumps(value)
+    return rule["message"].replace(VALUE_TEMPLATE, value)
+
+
+def check_type(rule, value):
+    types = rule["value"] if isinstance(rule["value"], list) else [rule["value"]]
+    if not any(TYPES[x](value) for x in types):
+        return [f"{json.dumps(value)} is not of type {' or '.join(types)}"]
+    return []
+
+
+def check_required(rule, value):
+    if not isinstance(value, dict):
+        return []
+    return [f"'{x}' is a required property" for x in rule["value"] if x not in value]
+
+
+def check_enum(rule, value):
+    if value not in rule["value"]:
+        return [f"{json.dumps(value)} is not one of {json.dumps(rule['value'])}"]
+    return []
+
+
+def check_const(rule, value):
+    if value != rule["value"]:
+        return [f"{json.dumps(value)} is not {json.dumps(rule['value'])}"]
+    return []
+
+
+def check_pattern(rule, value):
+    if isinstance(value, str) and not rule["regex"].search(value):
+        return [f"'{value}' does not match '{rule['value']}'"]
+    return []
+
+
+def check_min_length(rule, value):
+    if isinstance(value, str) and len(value) < rule["value"]:
+        return [f"'{value}' is too short"]
+    return []
+
+
+CHECKS = {
+    "type": check_type,
+    "required": check_required,
+    "enum": check_enum,
+    "const": check_const,
+    "pattern": check_pattern,
+    "minLength": check_min_length,
+}
+
+
+# group rules by path, so every path of the document is resolved only once. Regular expressions are compiled here.
+# Rules for properties in 'ignored_properties' are skipped.
+def prepare_schema(compiled_schema, ignored_properties=frozenset()):
+    return prepare_rules(compiled_schema["rules"], set(ignored_properties))
+
+
+# equal guards are prepared once and shared by all rules, so a guard is evaluated only once per node
+def prepare_rules(rules, ignored_properties, prepared_guards=None):
+    if prepared_guards is None:
+        prepared_guards = {}
+    rules_by_path = {}
+    for rule in rules:
+        if ignored_properties & {x for x in rule["path"] if x != "*"}:
+            continue
+        rule = dict(rule)
+        if rule["keyword"] == "required":
+            rule["value"] = [x for x in rule["value"] if x not in ignored_properties]
+        if rule["keyword"] == "pattern":
+            rule["regex"] = re.compile(rule["value"])
+        guards = []
+        for guard in rule["guards"]:
+            guard_key = json.dumps(guard, sort_keys=True)
+            if guard_key not in prepared_guards:
+                guard_rules = prepare_rules(guard["rules"], set(), prepared_guards)
+                prepared_guards[guard_key] = dict(guard, rules=guard_rules)
+            guards.append(prepared_guards[guard_key])
+        rule["guards"] = guards
+        rules_by_path.setdefault(tuple(rule["path"]), []).append(rule)
+    return rules_by_path
+
+
+def guards_pass(rule, parents, guard_results):
+    for guard in rule["guards"]:
+        node = parents[guard["depth"]]
+        key = (id(guard), id(node))
+        if key not in guard_results:
+            valid = not run_rules(guard["rules"], node, stop_on_error=True)
+            guard_results[key] = valid != guard["negate"]
+        if not guard_results[key]:
+            return False
+    return True
+
+
+# run rules against document, return list of (pointer segments, error message)
+def run_rules(rules_by_path, document, stop_on_error=False):
+    errors = []
+    guard_results = {}
+    for path, rules in rules_by_path.items():
+        for pointer, parents in resolve_nodes(document, path):
+            for rule in rules:
+                if not guards_pass(rule, parents, guard_results):
+                    continue
+                for message in CHECKS[rule["keyword"]](rule, parents[-1]):
+                    errors.append((pointer, get_message(rule, parents[-1], message)))
+                    if stop_on_error:
+                        return errors
+    return errors
+
+
+# validate document against prepared schema in one pass, return list of (JSON pointer, error message) in document order
+def validate(prepared_schema, document):
+    errors = sorted(run_rules(prepared_schema, document), key=lambda x: x[0])
+    return [
+        ("".join(f"/{escape_pointer_segment(x)}" for x in pointer), message)
+        for pointer, message in errors
+    ]
@@ -1,27 +1,60 @@
 #!/usr/bin/python
 
+import argparse
 import glob
+import hashlib
+import json
+import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from subprocess import PIPE, Popen
 
+import terraformDocsUtils
+import terraformHcl
 
-def terraform_init_upgrade():
+IBM_PROVIDER = "registry.terraform.io/ibm-cloud/ibm"
+LOCK_FILE = ".terraform.lock.hcl"
+CACHE_NAME = "provider-metadata"
+PLUGIN_CACHE_NAME = "terraform-plugins"
+METADATA_FILE = "module-metadata.json"
+# folders of submodules and solutions generated together with the root module
+MODULE_DIRS = ["modules", "solutions"]
+
+
+def terraform_init_upgrade(path="."):
+    # providers are downloaded only once per version and shared by all modules
+    env = dict(os.environ)
+    if not env.get("TF_PLUGIN_CACHE_DIR"):
+        plugin_cache_dir = terraformDocsUtils.get_cache_dir(PLUGIN_CACHE_NAME)
+        env["TF_PLUGIN_CACHE_DIR"] = plugin_cache_dir
     tf_init_upgrade_command = "terraform init --upgrade"
-    proc = Popen(tf_init_upgrade_command, stdout=PIPE, stderr=PIPE, shell=True)
+    proc = Popen(
+        tf_init_upgrade_command,
+        stdout=PIPE,
+        stderr=PIPE,
+        shell=True,
+        env=env,
+        cwd=path,
+    )
     error = proc.communicate()
     if proc.returncode != 0:
         print(error)
         sys.exit(proc.returncode)
 
 
-def get_terraform_provider():
-    for terraform_provider in Path(".terraform").rglob("provider_metadata.json"):
-        return terraform_provider
+# provider packages are symlinks to the plugin cache dir, so links are followed
+def get_terraform_provider(path="."):
+    providers_dir = os.path.join(path, ".terraform/providers")
+    for root, dirnames, filenames in os.walk(providers_dir, followlinks=True):
+        dirnames.sort()
+        if "provider_metadata.json" in filenames:
+            return Path(root) / "provider_metadata.json"
 
 
-def run_metadata_generator(file_path, terraform_provider):
+def run_metadata_generator(file_path, terraform_provider, path="."):
     tf_config_inspect_command = ""
     if terraform_provider:
         tf_config_inspect_command = (
@@ -30,37 +63,225 @@ def run_metadata_generator(file_path, terraform_provider):
     else:
         tf_config_inspect_command = "terraform-config-inspect --json"
 
-    proc = Popen(tf_config_inspect_command, stdout=PIPE, stderr=PIPE, shell=True)
+    proc = Popen(
+        tf_config_inspect_command, stdout=PIPE, stderr=PIPE, shell=True, cwd=path
+    )
     output, error = proc.communicate()
 
     if proc.returncode != 0:
         print(error)
         sys.exit(proc.returncode)
-    else:
-        with open(file_path, "wb") as binary_file:
-            binary_file.write(output)
+
+    # write metadata only if it changed, so file mtime is kept. Return True if it was written.
+    file_path = os.path.join(path, file_path)
+    if os.path.isfile(file_path):
+        with open(file_path, "rb") as binary_file:
+            if binary_file.read() == output:
+                return False
+    with open(file_path, "wb") as binary_file:
+        binary_file.write(output)
+    return True
 
 
-def remove_tf_IBM_provider():
-    dirpath = Path(".terraform/providers/registry.terraform.io/ibm-cloud")
+def remove_tf_IBM_provider(path="."):
+    dirpath = Path(path) / ".terraform/providers/registry.terraform.io/ibm-cloud"
     if dirpath.exists() and dirpath.is_dir():
         shutil.rmtree(dirpath)
 
 
-def main():
-    if glob.glob("*.tf"):
-        # remove IBM provider. Must be removed so we make sure that local terraform cache has the latest version only
-        remove_tf_IBM_provider()
+# return version of IBM provider locked in the lock file, None if it is not locked
+def get_locked_provider_version(path="."):
+    try:
+        with open(os.path.join(path, LOCK_FILE)) as f:
+            body = terraformHcl.parse(f.read())
+        for block in body.blocks_of_type("provider"):
+            if block.labels and block.labels[0] == IBM_PROVIDER:
+                version = block.body.attributes["version"]
+                return terraformHcl.literal_value(version.expression)
+    except (OSError, KeyError, ValueError, terraformHcl.HclError):
+        pass
+    return None
+
+
+# key of provider metadata: hash of the lock file and of the constraints 'terraform init' resolves
+# (terraform block and module sources and versions). If '*.tf' files can not be parsed, their whole content is used.
+def get_provider_metadata_key(path="."):
+    digest = hashlib.sha256()
+    lock_file = os.path.join(path, LOCK_FILE)
+    if os.path.isfile(lock_file):
+        with open(lock_file, "rb") as f:
+            digest.update(f.read())
+    try:
+        for file_name, body in terraformHcl.parse_directory(path):
+            for block in body.blocks_of_type("terraform") + body.blocks_of_type(
+                "module"
+            ):
+                constraints = [block.type] + block.labels
+                if block.type == "module":
+                    attributes = [
+                        block.body.attributes[x]
+                        for x in ("source", "version")
+                        if x in block.body.attributes
+                    ]
+                    constraints += [x.expression for x in attributes]
+                else:
+                    constraints += [
+                        f"{x.name}={x.expression}"
+                        for x in block.body.attributes.values()
+                    ]
+                    for providers in block.body.blocks_of_type("required_providers"):
+                        constraints += [
+                            f"{x.name}={x.expression}"
+                            for x in providers.body.attributes.values()
+                        ]
+                digest.update(json.dumps([file_name] + constraints).encode("utf-8"))
+    except terraformHcl.HclError:
+        for file_name in sorted(glob.glob(os.path.join(path, "*.tf"))):
+            with open(file_name, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_metadata_file(cache_dir, version):
+    return os.path.join(cache_dir, f"ibm-{version}.json")
+
+
+# return (True, cached provider metadata file or None if module does not use IBM provider) for the key,
+# (False, None) if the key is not cached
+def load_provider_metadata(cache_dir, key):
+    try:
+        with open(os.path.join(cache_dir, f"{key}.json")) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return False, None
+    # malformed entries (e.g. written by hand or truncated) are a cache miss
+    if not isinstance(entry, dict) or "version" not in entry:
+        return False, None
+    version = entry.get("version")
+    if version is None:
+        return True, None
+    if not isinstance(version, str):
+        return False, None
+    metadata_file = get_metadata_file(cache_dir, version)
+    if not os.path.isfile(metadata_file):
+        return False, None
+    return True, metadata_file
+
+
+# copy provider metadata of the initialized module to the cache, return cached metadata file
+def store_provider_metadata(cache_dir, key, terraform_provider):
+    version = None
+    metadata_file = None
+    if terraform_provider:
+        # path is .terraform/providers/registry.terraform.io/ibm-cloud/ibm/<version>/<os_arch>/provider_metadata.json
+        version = terraform_provider.parent.parent.name
+        metadata_file = get_metadata_file(cache_dir, version)
+        with open(terraform_provider, encoding="utf-8") as f:
+            terraformDocsUtils.write_file(metadata_file, f.read())
+    terraformDocsUtils.write_json(
+        os.path.join(cache_dir, f"{key}.json"), {"version": version}
+    )
+    return metadata_file
+
 
-        # always run terraform init upgrade
-        terraform_init_upgrade()
+# return provider metadata file of the module. 'terraform init' runs only if the lock file or the constraints changed
+# since the metadata was cached. In offline mode 'terraform init' never runs.
+def get_provider_metadata(offline=False, path="."):
+    # metadata file is passed to terraform-config-inspect running in module folders
+    cache_dir = os.path.abspath(terraformDocsUtils.get_cache_dir(CACHE_NAME))
+    cached, metadata_file = load_provider_metadata(
+        cache_dir, get_provider_metadata_key(path)
+    )
+    if cached:
+        return metadata_file
 
-        # get IBM terraform provider
-        terraform_provider = get_terraform_provider()
+    if offline:
+        lock_file = os.path.join(path, LOCK_FILE)
+        if not os.path.isfile(lock_file):
+            print(f"Error: {lock_file} does not exist, run without --offline")
+            sys.exit(1)
+        # lock file changed, but the locked provider version can still be cached
+        version = get_locked_provider_version(path)
+        if version is None:
+            return None
+        metadata_file = get_metadata_file(cache_dir, version)
+        if not os.path.isfile(metadata_file):
+            print(
+                f"Error: metadata of {IBM_PROVIDER} {version} is not cached, run without --offline"
+            )
+            sys.exit(1)
+        return metadata_file
 
-        # run metadata generator tool
-        metadata_name = "module-metadata.json"
-        run_metadata_generator(metadata_name, terraform_provider)
+    # remove IBM provider. Must be removed so we make sure that local terraform cache has the latest version only
+    remove_tf_IBM_provider(path)
+
+    # run terraform init upgrade, lock file is updated
+    terraform_init_upgrade(path)
+
+    # get IBM terraform provider and cache it for the updated lock file
+    return store_provider_metadata(
+        cache_dir, get_provider_metadata_key(path), get_terraform_provider(path)
+    )
+
+
+# return root module and every submodule and solution (modules/*, solutions/*) which has '*.tf' files
+def get_module_paths():
+    paths = ["."]
+    for module_dir in MODULE_DIRS:
+        paths += sorted(glob.glob(os.path.join(module_dir, "*", "")))
+    return [os.path.normpath(x) for x in paths if glob.glob(os.path.join(x, "*.tf"))]
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(description="Generate module-metadata.json file")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        dest="offline",
+        help="Do not run 'terraform init', use cached provider metadata only",
+        default=False,
+    )
+    parser.add_argument(
+        "--all-modules",
+        action="store_true",
+        dest="all_modules",
+        help=f"Generate {METADATA_FILE} for the root module, modules/* and solutions/*",
+        default=False,
+    )
+    terraformDocsUtils.add_jobs_argument(parser, f"{METADATA_FILE} files generated")
+    return parser
+
+
+def main(offline=False, all_modules=False, jobs=terraformDocsUtils.DEFAULT_JOBS):
+    if all_modules:
+        paths = get_module_paths()
+    else:
+        paths = ["."] if glob.glob("*.tf") else []
+    if not paths:
+        return
+
+    # get IBM terraform provider metadata once (of the root module if it has '*.tf' files), it is shared by all modules
+    terraform_provider = get_provider_metadata(offline, paths[0])
+
+    # run metadata generator tool
+    if len(paths) == 1:
+        run_metadata_generator(METADATA_FILE, terraform_provider, paths[0])
+        return
+
+    # modules are independent, metadata is generated in a process pool
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(paths)))) as executor:
+        modified = sum(
+            executor.map(
+                run_metadata_generator,
+                repeat(METADATA_FILE),
+                repeat(terraform_provider),
+                paths,
+            )
+        )
+    if modified:
+        print(f"{modified} {METADATA_FILE} file(s) updated")
 
 
-main()
+if __name__ == "__main__":
+    args = initialize_parser().parse_args()
+    main(args.offline, args.all_modules, args.jobs)
@@ -1,9 +1,12 @@
 #!/usr/bin/python
 
-import os
-
+import terraformDocsIndex
 import terraformDocsUtils
 
+HOOK_TAG = "BEGIN EXAMPLES HOOK"
+HOOK_BEGIN = "<!-- BEGIN EXAMPLES HOOK -->"
+HOOK_END = "<!-- END EXAMPLES HOOK -->"
+
 
 def prepare_lines(readme_titles, newlines):
     if len(readme_titles) > 0:
@@ -21,23 +24,22 @@ def prepare_lines(readme_titles, newlines):
         newlines.append(prepare_line)
 
 
-def run_terraform_docs():
-    os.system(
-        "terraform-docs -c common-dev-assets/module-assets/.terraform-docs-config-examples.yaml ."
-    )
-
-
-def main():
-    examples_markdown = "EXAMPLES.md"
-    if os.path.isdir("examples") and terraformDocsUtils.is_hook_exists(
-        "BEGIN EXAMPLES HOOK"
-    ):
+def main(index=None):
+    if index is None:
+        index = terraformDocsIndex.RepositoryIndex(markers=[HOOK_TAG])
+    if index.is_dir("examples") and index.is_hook_exists(HOOK_TAG):
         newlines = []
-        readme_titles = terraformDocsUtils.get_readme_titles("examples")
+        readme_titles = index.get_readme_titles("examples")
         prepare_lines(readme_titles, newlines)
-        terraformDocsUtils.create_markdown(newlines, examples_markdown)
-        run_terraform_docs()
-        terraformDocsUtils.remove_markdown(examples_markdown)
+        # add examples section to README
+        content = "## Examples\n\n" + "\n".join(newlines)
+        try:
+            terraformDocsUtils.inject_hook_content(
+                "README.md", HOOK_BEGIN, HOOK_END, content
+            )
+        except ValueError as e:
+            print(f"Error adding examples to README: {e}")
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -52,4 +52,5 @@ def main():
             set_go_mod(go_mod_path, module_url)
 
 
-main()
+if __name__ == "__main__":
+    main()
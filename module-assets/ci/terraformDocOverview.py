@@ -3,88 +3,69 @@
 import os
 import pathlib
 import re
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import terraformDocGoMod
+import terraformDocsIndex
 import terraformDocsUtils
 
-
-# Check if a line is a heading
-def get_title(
-    line: str, code_block: bool, comment_block: bool
-) -> tuple[int, str, bool, bool]:
-    level = 0
-    for c in line:
-        # set a flag to know if the lines are inside code block
-        if "```" in line:
-            code_block = not code_block
-            break
-        # one line comment, skip it
-        elif "<!--" in line and "-->" in line:
-            break
-        # comment block begin -> set flag to true
-        elif "<!--" in line:
-            comment_block = True
-            break
-        # comment block end -> set flag to false
-        elif "-->" in line:
-            comment_block = False
-            break
-        # do not check lines if they are inside comment or code block
-        elif code_block is False and comment_block is False:
-            if c == "#":
-                level += 1
-            else:
-                break
-    title = line[level + 1 : -1]
-
-    return (level, title, code_block, comment_block)
+HOOK_TAG = "<!-- BEGIN OVERVIEW HOOK -->"
+HOOK_END = "<!-- END OVERVIEW HOOK -->"
+# README file name (case-insensitive) and README file name at the end of a path
+README_FILE_PATTERN = re.compile(r"README\.md", re.IGNORECASE)
+README_PATH_PATTERN = re.compile(r"/README.md", re.IGNORECASE)
+
+
+# read markdown file in one pass, return (headings, hook tags of 'hook_tags' found in the file). Headings are
+# (level, title, anchor), lines inside code blocks and comment blocks are not headings.
+def get_markdown_index(md_file="./README.md", hook_tags=()):
+    headings: list[tuple[int, str, str]] = []
+    found_hook_tags = set()
+    code_block = False
+    comment_block = False
+    with open(md_file) as f:
+        for line in f:
+            for hook_tag in hook_tags:
+                if hook_tag in line:
+                    found_hook_tags.add(hook_tag)
+
+            # set a flag to know if the lines are inside code block
+            if "```" in line:
+                code_block = not code_block
+            elif "<!--" in line:
+                # comment block begin -> set flag to true, one line comment is skipped
+                if "-->" not in line:
+                    comment_block = True
+            # comment block end -> set flag to false
+            elif "-->" in line:
+                comment_block = False
+            # do not check lines if they are inside comment or code block
+            elif not code_block and not comment_block and line.startswith("#"):
+                level = len(line) - len(line.lstrip("#"))
+                title = line[level + 1 : -1]
+                anchor = title.replace(" ", "-").lower()
+                headings.append((level, title, anchor))
+    return headings, found_hook_tags
 
 
 # get main readme headings
-def get_main_readme_headings():
+def get_main_readme_headings(headings):
     data = []
-    with open("./README.md") as f:
-        code_block = False
-        comment_block = False
-        for line in f.readlines():
-            level, title, code_block, comment_block = get_title(
-                line, code_block, comment_block
-            )
-            code_block = code_block
-            comment_block = comment_block
-
-            # known issues, developing and contributing must be added to overview at level 0
-            if (
-                "known issues" == title.lower()
-                or "developing" == title.lower()
-                or "contributing" == title.lower()
-            ):
-                anchor = title.replace(" ", "-").lower()
-                heading = f'  <li><a href="#{anchor}">{title}</a></li>'
-                data.append(heading)
+    for level, title, anchor in headings:
+        # known issues, developing and contributing must be added to overview at level 0
+        if title.lower() in ("known issues", "developing", "contributing"):
+            heading = f'  <li><a href="#{anchor}">{title}</a></li>'
+            data.append(heading)
     return data
 
 
-def has_compliance_and_security_section():
+def has_compliance_and_security_section(headings):
     """Check if README.md contains a 'Compliance and security' header"""
-    try:
-        with open("./README.md") as f:
-            code_block = False
-            comment_block = False
-            for line in f.readlines():
-                level, title, code_block, comment_block = get_title(
-                    line, code_block, comment_block
-                )
-                code_block = code_block
-                comment_block = comment_block
-
-                # Check if this is a level 2 heading (##) with the title "Compliance and security"
-                if level == 2 and title.lower() == "compliance and security":
-                    return True
-        return False
-    except FileNotFoundError:
-        return False
+    # Check if there is a level 2 heading (##) with the title "Compliance and security"
+    return any(
+        level == 2 and title.lower() == "compliance and security"
+        for level, title, anchor in headings
+    )
 
 
 def get_repo_info():
@@ -132,14 +113,16 @@ def generate_deploy_tip():
     return "ℹ️ Ctrl/Cmd+Click or right-click on the Schematics deploy button to open in a new tab."
 
 
+# add deploy button to README of an example, return True if README was modified
 def add_deploy_button_to_example_readme(example_path, repo_url, module_name):
     readme_path = os.path.join(example_path, "README.md")
     if not os.path.exists(readme_path):
-        return
+        return False
 
-    # Read existing README content
-    with open(readme_path) as f:
-        content = f.read()
+    # Read existing README content, line endings are normalized the same way as text mode does
+    with open(readme_path, encoding="utf-8", newline="") as f:
+        original_content = f.read()
+    content = original_content.replace("\r\n", "\n").replace("\r", "\n")
 
     example_name = os.path.basename(example_path)
     deploy_url = generate_deploy_url(repo_url, module_name, example_name)
@@ -183,32 +166,41 @@ def add_deploy_button_to_example_readme(example_path, repo_url, module_name):
 
     content = content.rstrip() + "\n"
 
-    # Write back to README
-    with open(readme_path, "w") as f:
-        f.write(content)
-
-
-def update_all_example_readmes(repo_url, module_name):
-    if not os.path.isdir("examples"):
-        return
-
-    # Find all example directories
-    for example_dir in os.listdir("examples"):
-        example_path = os.path.join("examples", example_dir)
-
-        # Skip if not a directory or starts with dot
-        if not os.path.isdir(example_path) or example_dir.startswith("."):
-            continue
-
-        # Check if directory has terraform files
-        if not terraformDocsUtils.has_tf_files(example_path):
-            continue
-
-        # Add deploy button to this example's README
-        add_deploy_button_to_example_readme(example_path, repo_url, module_name)
+    # Write back to README only if it changed, so README mtime is kept
+    if content == original_content:
+        return False
+    terraformDocsUtils.write_file(readme_path, content)
+    return True
+
+
+# add deploy button to README of every example concurrently, return number of modified README files
+def update_all_example_readmes(
+    repo_url, module_name, index, jobs=terraformDocsUtils.DEFAULT_JOBS
+):
+    if not index.is_dir("examples"):
+        return 0
+
+    # Find all example directories (directories starting with dot are not indexed) with terraform files
+    example_paths = [
+        os.path.join("examples", example_dir)
+        for example_dir in index.list_dirs("examples")
+        if index.has_tf_files(os.path.join("examples", example_dir))
+    ]
+
+    # Add deploy button to README of each example, examples are independent
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        modified = sum(
+            executor.map(
+                lambda x: add_deploy_button_to_example_readme(x, repo_url, module_name),
+                example_paths,
+            )
+        )
+    if modified:
+        print(f"Schematics deploy button updated in {modified} example README file(s)")
+    return modified
 
 
-def get_headings(folder_name, repo_url, module_name):
+def get_headings(folder_name, repo_url, module_name, index):
     readme_headings: list[str] = []
 
     # Map "Deployable Architectures" to "solutions" directory
@@ -218,49 +210,30 @@ def get_headings(folder_name, repo_url, module_name):
         else folder_name.lower()
     )
 
-    if os.path.isdir(directory_name):
-        for readme_file_path in Path(directory_name).rglob("*"):
-            path = str(readme_file_path)
-            regex_pattern = r"README.md"
-
-            # Compile the regex pattern and ignore case
-            regex = re.compile(regex_pattern, re.IGNORECASE)
-
-            if not regex.search(path):
-                continue
-
-            # ignore README file if it has dot(.) in a path or the parent path does not contain any tf file
-            if ("/.") not in path and terraformDocsUtils.has_tf_files(
-                readme_file_path.parent
-            ):
-                regex_pattern = r"/README.md"
+    if index.is_dir(directory_name):
+        for path in index.find_files(directory_name, README_FILE_PATTERN):
+            # ignore README file if the parent path does not contain any tf file (directories starting with dot are not indexed)
+            if index.has_tf_files(os.path.dirname(path)):
                 data = None
                 if "modules" == folder_name.lower():
-                    module_name_display = re.sub(
-                        regex_pattern,
-                        "",
-                        path.replace("modules/", ""),
-                        flags=re.IGNORECASE,
+                    module_name_display = README_PATH_PATTERN.sub(
+                        "", path.replace("modules/", "")
                     )
-                    module_path = re.sub(regex_pattern, "", path, flags=re.IGNORECASE)
+                    module_path = README_PATH_PATTERN.sub("", path)
                     data = f'      <li><a href="{repo_url}/tree/main/{module_path}">{module_name_display}</a></li>'
                 elif folder_name == "Deployable Architectures":
                     # for deployable architectures bullet point name is title in solution's README
-                    readme_title = terraformDocsUtils.get_readme_title(path)
+                    readme_title = index.get_readme(path)["title"]
                     if readme_title:
                         title = readme_title.strip().replace("\n", "").replace("# ", "")
-                        solution_path = re.sub(
-                            regex_pattern, "", path, flags=re.IGNORECASE
-                        )
+                        solution_path = README_PATH_PATTERN.sub("", path)
                         data = f'      <li><a href="{repo_url}/tree/main/{solution_path}">{title}</a></li>'
                 else:
                     # for examples bullet point name is title in example's README
-                    readme_title = terraformDocsUtils.get_readme_title(path)
+                    readme_title = index.get_readme(path)["title"]
                     if readme_title:
                         title = readme_title.strip().replace("\n", "").replace("# ", "")
-                        example_path = re.sub(
-                            regex_pattern, "", path, flags=re.IGNORECASE
-                        )
+                        example_path = README_PATH_PATTERN.sub("", path)
                         example_name = os.path.basename(example_path)
 
                         # Generate deploy URL and button
@@ -283,7 +256,9 @@ def get_headings(folder_name, repo_url, module_name):
     return sorted(readme_headings)
 
 
-def add_to_overview(overview, folder_name, repo_url, module_name):
+# add section of a folder to the overview model. Section is a link to the folder and items (links to modules,
+# examples or solutions inside the folder)
+def add_to_overview(overview, folder_name, repo_url, module_name, index):
     # Map "Deployable Architectures" to "solutions" directory
     directory_name = (
         "solutions"
@@ -291,53 +266,48 @@ def add_to_overview(overview, folder_name, repo_url, module_name):
         else folder_name.lower()
     )
 
-    if os.path.isdir(directory_name):
-        # get headings
-        readme_titles = get_headings(folder_name, repo_url, module_name)
-
-        if folder_name == "Examples" and readme_titles:
-            # Use HTML format for Examples section
-            display_name = "Submodules" if folder_name == "Modules" else folder_name
-            bullet_point = f'  <li><a href="{repo_url}/tree/main/{directory_name}">{display_name}</a>'
-            overview.append(bullet_point)
-            bullet_point_index = overview.index(bullet_point)
-            overview.insert(bullet_point_index + 1, "    <ul>")
-            for index, readme_file_path in enumerate(readme_titles):
-                overview.insert(index + bullet_point_index + 2, readme_file_path)
-
-            overview.insert(bullet_point_index + 2 + len(readme_titles), "    </ul>")
-
-            tip = "    " + generate_deploy_tip()
-            overview.insert(bullet_point_index + 3 + len(readme_titles), tip)
-            overview.insert(bullet_point_index + 4 + len(readme_titles), "  </li>")
-        else:
-            display_name = "Submodules" if folder_name == "Modules" else folder_name
-            bullet_point = f'  <li><a href="{repo_url}/tree/main/{directory_name}">{display_name}</a>'
-            overview.append(bullet_point)
-            bullet_point_index = overview.index(bullet_point)
-
-            if readme_titles:
-                overview.insert(bullet_point_index + 1, "    <ul>")
-
-                for index, readme_file_path in enumerate(readme_titles):
-                    overview.insert(index + bullet_point_index + 2, readme_file_path)
-
-                overview.insert(
-                    bullet_point_index + 2 + len(readme_titles), "    </ul>"
-                )
-                overview.insert(bullet_point_index + 3 + len(readme_titles), "  </li>")
-            else:
-                overview.insert(bullet_point_index + 1, "  </li>")
-
-
-def main():
-    repo_url, module_name = get_repo_info()
+    if index.is_dir(directory_name):
+        display_name = "Submodules" if folder_name == "Modules" else folder_name
+        overview.append(
+            {
+                "link": f'  <li><a href="{repo_url}/tree/main/{directory_name}">{display_name}</a>',
+                # get headings
+                "items": get_headings(folder_name, repo_url, module_name, index),
+                # Examples section has a tip about the deploy buttons
+                "tip": generate_deploy_tip() if folder_name == "Examples" else None,
+            }
+        )
 
-    if terraformDocsUtils.is_hook_exists("<!-- BEGIN OVERVIEW HOOK -->"):
-        overview: list[str] = []
-        overview_markdown = "overview.md"
 
-        overview.append("<ul>")
+# render overview model (lines and sections) to HTML list in a single pass
+def render_overview(overview) -> list[str]:
+    lines = ["<ul>"]
+    for entry in overview:
+        if isinstance(entry, str):
+            lines.append(entry)
+            continue
+
+        lines.append(entry["link"])
+        if entry["items"]:
+            lines.append("    <ul>")
+            lines.extend(entry["items"])
+            lines.append("    </ul>")
+            if entry["tip"]:
+                lines.append("    " + entry["tip"])
+        lines.append("  </li>")
+    lines.append("</ul>")
+    return lines
+
+
+def main(index=None):
+    if index is None:
+        index = terraformDocsIndex.RepositoryIndex()
+    repo_url, module_name = get_repo_info()
+
+    # main README is read only once, headings and hook tag are taken from its index
+    headings, hook_tags = get_markdown_index("./README.md", [HOOK_TAG])
+    if HOOK_TAG in hook_tags:
+        overview: list = []
 
         # add module name to an overview as a first element (HTML format)
         path = pathlib.PurePath(terraformDocsUtils.get_module_url())
@@ -345,37 +315,39 @@ def main():
         overview.append(f'  <li><a href="#{repo_name}">{repo_name}</a></li>')
 
         # add modules to "overview"
-        add_to_overview(overview, "Modules", repo_url, module_name)
+        add_to_overview(overview, "Modules", repo_url, module_name, index)
 
         # add compliance and security section if it exists in README
-        if has_compliance_and_security_section():
+        if has_compliance_and_security_section(headings):
             compliance_link = '  <li><a href="#compliance-and-security">Compliance and security</a></li>'
             overview.append(compliance_link)
 
         # add examples to "overview"
-        add_to_overview(overview, "Examples", repo_url, module_name)
+        add_to_overview(overview, "Examples", repo_url, module_name, index)
 
         # add deployable architectures (solutions) to "overview"
-        add_to_overview(overview, "Deployable Architectures", repo_url, module_name)
+        add_to_overview(
+            overview, "Deployable Architectures", repo_url, module_name, index
+        )
 
         # add headings from README (known issues, contributing, or developing) to overview
-        readme_headings = get_main_readme_headings()
+        readme_headings = get_main_readme_headings(headings)
         for heading in readme_headings:
             overview.append(heading)
 
-        overview.append("</ul>")
-
-        # create markdown
-        terraformDocsUtils.create_markdown(overview, overview_markdown)
-
-        # run terraform docs
-        os.system(
-            "terraform-docs -c common-dev-assets/module-assets/.terraform-docs-config-overview.yaml ."
-        )
-
-        terraformDocsUtils.remove_markdown(overview_markdown)
+        # add overview section to README
+        content = "## Overview\n" + "\n".join(render_overview(overview))
+        try:
+            terraformDocsUtils.inject_hook_content(
+                "README.md", HOOK_TAG, HOOK_END, content
+            )
+        except ValueError as e:
+            print(f"Error adding overview to README: {e}")
 
-    update_all_example_readmes(repo_url, module_name)
+    update_all_example_readmes(repo_url, module_name, index)
 
 
-main()
+if __name__ == "__main__":
+    # go.mod module repository is updated together with the overview
+    terraformDocGoMod.main()
+    main()
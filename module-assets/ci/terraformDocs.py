@@ -1,94 +1,202 @@
 #!/usr/bin/python
 
+import argparse
+import hashlib
+import json
 import os
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import PIPE, Popen
 
+import terraformDocsIndex
 import terraformDocsUtils
+import terraformInputsCache
 
+HOOK_BEGIN = "<!-- BEGINNING OF PRE-COMMIT-TERRAFORM DOCS HOOK -->"
+HOOK_END = "<!-- END OF PRE-COMMIT-TERRAFORM DOCS HOOK -->"
+TERRAFORM_DOCS_COMMAND = ["terraform-docs", "--hide", "providers", "markdown", "table"]
+MANIFEST_CACHE_NAME = "terraform-docs"
+# change the version whenever the generated content changes for the same inputs
+MANIFEST_VERSION = "1"
 
-def modify_temp_markdown_file(temp_markdown: str) -> list[str]:
-    # temp markdowns
-    markdown = "tf-docs.md"
-    temp_markdowns = []
 
-    # Find all previously generated temp markdowns and modify them
-    for root, dirnames, filenames in os.walk("."):
-        for name in filenames:
-            if name == temp_markdown:
-                # get full markdowns path
-                markdown_path = os.path.join(root, temp_markdown)
-                new_markdown_path = os.path.join(root, markdown)
-
-                # save all temp markdowns for later to be delete it
-                temp_markdowns.append(markdown_path)
-                temp_markdowns.append(new_markdown_path)
-
-                # change headings from lvl 2 to lvl 3 and save tf docs content into new temp file
-                with open(markdown_path) as reader:
-                    with open(new_markdown_path, "w") as writer:
-                        for line in reader:
-                            # tf_docs adds BEGIN_TF_DOCS and END_TF_DOCS metatags to a markdown content by default. We do not need this, since we have own metatag
-                            if not ("BEGIN_TF_DOCS" in line or "END_TF_DOCS" in line):
-                                writer.write(line.replace("##", "###"))
-    return temp_markdowns
+# change headings from lvl 2 to lvl 3 of tf docs content lines
+def modify_markdown_lines(lines):
+    for line in lines:
+        # tf_docs can add BEGIN_TF_DOCS and END_TF_DOCS metatags to a markdown content. We do not need this, since we have own metatag
+        if not ("BEGIN_TF_DOCS" in line or "END_TF_DOCS" in line):
+            yield line.replace("##", "###")
 
 
 # find all README files that have pre-commit hook metatag
-def get_valid_readme_paths() -> list[str]:
-    paths = []
-    dir = os.getcwd()
-    hook_tag = "<!-- BEGINNING OF PRE-COMMIT-TERRAFORM DOCS HOOK -->"
-    for readme_file in Path(dir).rglob("README.md"):
-        path = str(readme_file)
-        if ("/.") not in path and terraformDocsUtils.is_hook_exists(hook_tag, path):
-            paths.append(str(readme_file.parent))
-    return paths
-
-
-# run tf_docs against a folder where valid README file exists
-def update_readme(path: str):
-    # temp markdown name
-    temp_markdown = "temp-tf-docs.md"
-
-    # list of temporary markdown files
-    temp_markdowns = []
-
-    # create temp markdown with tf_docs content
-    command = f"terraform-docs --hide providers markdown table --output-file {temp_markdown} {path}"
-    proc = Popen(command, stdout=PIPE, stderr=PIPE, shell=True)
-    proc.communicate()
-
-    # hard fail if error occurs
-    if proc.returncode != 0:
-        print(f"Error creating temp markdowns: {proc.communicate()[1]}")
-        sys.exit(proc.returncode)
+def get_valid_readme_paths(index) -> list[str]:
+    return [
+        os.path.abspath(os.path.dirname(readme_file["path"]))
+        for readme_file in index.find_readme_files(".")
+        if index.is_hook_exists(HOOK_BEGIN, readme_file["path"])
+    ]
 
-    # modify and prepare temp markdown file
-    temp_markdowns = modify_temp_markdown_file(temp_markdown)
 
-    # add temp markdown content to README file
-    command = f"terraform-docs -c common-dev-assets/module-assets/.terraform-docs-config.yaml {path}"
-    proc = Popen(command, stdout=PIPE, stderr=PIPE, shell=True)
-    proc.communicate()
+# run tf_docs against a folder where valid README file exists. tf_docs content is read from stdout and added to README in memory
+def update_readme(path: str):
+    command = TERRAFORM_DOCS_COMMAND + [path]
+    proc = Popen(command, stdout=PIPE, stderr=PIPE, encoding="utf-8")
+    output, error = proc.communicate()
+    content = "".join(modify_markdown_lines(output.splitlines(keepends=True)))
 
     # hard fail if error occurs
     if proc.returncode != 0:
-        print(f"Error adding content to README: {proc.communicate()[1]}")
-        for markdown in temp_markdowns:
-            terraformDocsUtils.remove_markdown(markdown)
+        print(f"Error creating terraform docs content: {error}")
         sys.exit(proc.returncode)
 
-    # remove all temp markdowns
-    for markdown in temp_markdowns:
-        terraformDocsUtils.remove_markdown(markdown)
-
-
-def main():
-    paths = get_valid_readme_paths()
-    for path in paths:
+    # terraform-docs prints content with a trailing new line
+    if content.endswith("\n"):
+        content = content[:-1]
+
+    # add tf docs content to README file
+    try:
+        terraformDocsUtils.inject_hook_content(
+            os.path.join(path, "README.md"), HOOK_BEGIN, HOOK_END, content
+        )
+    except ValueError as e:
+        print(f"Error adding content to README: {e}")
+        sys.exit(1)
+
+
+# manifest of module and README hook section hashes from the last run, one manifest per repository
+def get_manifest_file():
+    repo_key = hashlib.sha256(os.getcwd().encode("utf-8")).hexdigest()
+    cache_dir = terraformDocsUtils.get_cache_dir(MANIFEST_CACHE_NAME)
+    return os.path.join(cache_dir, f"manifest-{repo_key}.json")
+
+
+def load_manifest(manifest_file):
+    try:
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # manifest or entries of another shape (e.g. edited by hand) are a cache miss
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    modules = manifest.get("modules")
+    if not isinstance(modules, dict):
+        return {}
+    return {
+        readme_file: entry
+        for readme_file, entry in modules.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("module"), str)
+        and isinstance(entry.get("section"), str)
+    }
+
+
+def save_manifest(manifest_file, modules):
+    try:
+        terraformDocsUtils.write_json(
+            manifest_file, {"version": MANIFEST_VERSION, "modules": modules}
+        )
+    except OSError:
+        pass
+
+
+# hash of everything the generated content depends on: terraform-docs version and command, '*.tf' files and terraform-docs config files
+def get_module_hash(path, terraform_docs_version):
+    digest = hashlib.sha256(MANIFEST_VERSION.encode("utf-8"))
+    digest.update(" ".join(TERRAFORM_DOCS_COMMAND).encode("utf-8"))
+    config_files = terraformInputsCache.get_config_files(path)
+    digest.update(
+        terraformInputsCache.get_cache_key(
+            path, terraform_docs_version, config_files=config_files
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+# hash of the README hook section (markers included), None if the section does not exist
+def get_section_hash(readme_file):
+    with open(readme_file, "rb") as f:
+        content = f.read()
+    begin_index = content.find(HOOK_BEGIN.encode("utf-8"))
+    end_index = content.find(HOOK_END.encode("utf-8"))
+    if begin_index < 0 or end_index < begin_index:
+        return None
+    section = content[begin_index : end_index + len(HOOK_END)]
+    return hashlib.sha256(section).hexdigest()
+
+
+# update README of a module unless the module and the README hook section are unchanged since the last run
+# return (README file, manifest entry)
+def update_readme_if_changed(path, manifest, terraform_docs_version, force=False):
+    readme_file = os.path.join(path, "README.md")
+    # manifest can not be used without terraform-docs version (e.g. missing terraform-docs binary)
+    if terraform_docs_version is None:
         update_readme(path)
-
-
-main()
+        return readme_file, None
+
+    module_hash = get_module_hash(path, terraform_docs_version)
+    entry = manifest.get(readme_file)
+    if (
+        not force
+        and entry
+        and entry["module"] == module_hash
+        and entry["section"] == get_section_hash(readme_file)
+    ):
+        return readme_file, entry
+
+    update_readme(path)
+    entry = {"module": module_hash, "section": get_section_hash(readme_file)}
+    return readme_file, entry
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(
+        description="Add terraform docs section to README files"
+    )
+    terraformDocsUtils.add_jobs_argument(parser, "README files updated")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        dest="force",
+        help="Update all README files, even if their modules did not change since the last run",
+        default=False,
+    )
+    return parser
+
+
+def main(index=None, jobs=terraformDocsUtils.DEFAULT_JOBS, force=False):
+    if index is None:
+        index = terraformDocsIndex.RepositoryIndex(markers=[HOOK_BEGIN])
+    paths = get_valid_readme_paths(index)
+
+    manifest_file = None
+    manifest = {}
+    terraform_docs_version = None
+    try:
+        manifest_file = get_manifest_file()
+        manifest = load_manifest(manifest_file)
+        terraform_docs_version = terraformInputsCache.get_terraform_docs_version(
+            terraformDocsUtils.get_cache_dir(terraformInputsCache.CACHE_NAME)
+        )
+    except OSError:
+        pass
+
+    # every module is updated in its own folder, so modules are independent and can be updated concurrently
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        # consume results, so an error (sys.exit) of any module is raised here
+        entries = list(
+            executor.map(
+                lambda x: update_readme_if_changed(
+                    x, manifest, terraform_docs_version, force
+                ),
+                paths,
+            )
+        )
+
+    if manifest_file and terraform_docs_version:
+        save_manifest(manifest_file, dict(entries))
+
+
+if __name__ == "__main__":
+    args = initialize_parser().parse_args()
+    main(jobs=args.jobs, force=args.force)
@@ -0,0 +1,100 @@
+import os
+
+import terraformDocsUtils
+
+
+# in-memory index of a repository shared by the doc generators (see docs.py), so the tree is walked only once
+# and every README is read only once per process. Hidden and ignored directories are not indexed.
+# Paths are relative to the repository root and normalized, e.g. 'examples/basic/README.md'.
+class RepositoryIndex:
+    def __init__(self, root=".", markers=()):
+        self.root = root
+        # markers every README is scanned for
+        self.markers = list(markers)
+        # directory -> (subdirectory names, file names)
+        self.directories = {}
+        self.tf_directories = {}
+        self.readmes = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                x
+                for x in dirnames
+                if not x.startswith(".") and x not in terraformDocsUtils.IGNORED_DIRS
+            ]
+            directory = os.path.normpath(os.path.relpath(dirpath, root))
+            self.directories[directory] = (sorted(dirnames), sorted(filenames))
+
+    def is_dir(self, path):
+        return os.path.normpath(path) in self.directories
+
+    # return file names of a directory, directories which are not indexed are listed from the disk
+    def list_files(self, path):
+        path = os.path.normpath(path)
+        if path in self.directories:
+            return self.directories[path][1]
+        return os.listdir(os.path.join(self.root, path))
+
+    def list_dirs(self, path):
+        return self.directories.get(os.path.normpath(path), ([], []))[0]
+
+    # return all indexed directories under 'path' (including 'path' itself)
+    def walk(self, path):
+        path = os.path.normpath(path)
+        if path == ".":
+            return list(self.directories)
+        prefix = path + os.sep
+        return [x for x in self.directories if x == path or x.startswith(prefix)]
+
+    # return paths of all indexed files under 'path' whose name matches the compiled 'pattern'
+    def find_files(self, path, pattern):
+        return [
+            os.path.join(directory, file_name)
+            for directory in self.walk(path)
+            for file_name in self.list_files(directory)
+            if pattern.fullmatch(file_name)
+        ]
+
+    # check if folder contains any tf file
+    def has_tf_files(self, path):
+        path = os.path.normpath(path)
+        if path not in self.tf_directories:
+            self.tf_directories[path] = any(
+                x.endswith(".tf") for x in self.list_files(path)
+            )
+        return self.tf_directories[path]
+
+    # return {"path": README path, "title": first line, "markers": markers the README contains}, README is read only once
+    def get_readme(self, path):
+        path = os.path.normpath(path)
+        if path not in self.readmes:
+            title, markers = terraformDocsUtils.scan_markdown(
+                os.path.join(self.root, path), self.markers
+            )
+            self.readmes[path] = {"path": path, "title": title, "markers": markers}
+        return self.readmes[path]
+
+    # check if hook tag exists on README (markers which are not indexed are searched in the file)
+    def is_hook_exists(self, hook_tag, md_file="README.md"):
+        if hook_tag in self.markers:
+            return hook_tag in self.get_readme(md_file)["markers"]
+        return terraformDocsUtils.is_hook_exists(
+            hook_tag, os.path.join(self.root, md_file)
+        )
+
+    # find all README.md files inside specific path, sorted by path
+    # return list of {"path": README path, "title": first line, "markers": markers the README contains}
+    def find_readme_files(self, path):
+        readme_files = [
+            self.get_readme(os.path.join(x, "README.md"))
+            for x in self.walk(path)
+            if "README.md" in self.list_files(x)
+        ]
+        return sorted(readme_files, key=lambda x: x["path"])
+
+    # get first line of all README files inside specific path, README files of folders without tf files are ignored
+    def get_readme_titles(self, path):
+        return [
+            {"path": x["path"], "title": x["title"]}
+            for x in self.find_readme_files(path)
+            if x["title"] and self.has_tf_files(os.path.dirname(x["path"]))
+        ]
@@ -1,75 +1,249 @@
+import functools
+import json
 import os
+import re
+import stat
 import sys
-from pathlib import Path
+import tempfile
 from subprocess import PIPE, Popen
 from urllib.parse import urlparse
 
-
-# create temp markdown which content is added to main README
-def create_markdown(newlines, markdown):
-    with open(markdown, "w") as writer:
-        if len(newlines) > 0:
-            for line in newlines:
-                writer.writelines((str(line), "\n"))
-
-
-#  remove temp markdown
-def remove_markdown(markdown):
-    if os.path.exists(markdown):
-        os.remove(markdown)
-
-
-# check if folder contains any tf file
-def has_tf_files(path):
-    if any(File.endswith(".tf") for File in os.listdir(path)):
-        return True
-    else:
+CACHE_DIR_ENV = "COMMON_DEV_ASSETS_CACHE_DIR"
+# directories never indexed (see terraformDocsIndex.py), hidden directories (e.g. '.terraform', '.git') are ignored as well
+IGNORED_DIRS = {"node_modules"}
+# default number of parallel jobs of the hooks, see add_jobs_argument
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+SCAN_CHUNK_SIZE = 64 * 1024
+GIT_CONFIG_SECTION = re.compile(r'\s*\[\s*([^\s"\]]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+GIT_CONFIG_KEY = re.compile(r"\s*([A-Za-z][A-Za-z0-9-]*)\s*(?:=(.*))?$")
+
+
+# add '--jobs' / '-j' argument of a hook, 'work' describes what is done in parallel (e.g. "README files updated")
+def add_jobs_argument(parser, work):
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        action="store",
+        dest="jobs",
+        help=f"Maximum number of {work} in parallel (default: {DEFAULT_JOBS})",
+        default=DEFAULT_JOBS,
+    )
+
+
+# return (and create) a per-user cache directory shared by the hooks, e.g. ~/.cache/common-dev-assets/<name>
+def get_cache_dir(name):
+    cache_root = os.environ.get(CACHE_DIR_ENV)
+    if not cache_root:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        cache_root = os.path.join(xdg_cache_home, "common-dev-assets")
+    cache_dir = os.path.join(cache_root, name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+# write a JSON file atomically, so parallel hooks never read a partially written file
+def write_json(file_path, data):
+    write_file(file_path, json.dumps(data))
+
+
+# write a file atomically (temp file in the same folder and rename). Permissions of an existing file are kept.
+def write_file(file_path, content):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        if os.path.exists(file_path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# replace hook section of a file ('begin' marker, content and 'end' marker) with 'content' in the same way
+# as terraform-docs 'inject' output mode does. The file is written only if it changes, return True if it was changed.
+def inject_hook_content(file_path, begin, end, content):
+    with open(file_path, encoding="utf-8", newline="") as reader:
+        file_content = reader.read()
+
+    begin_index = file_content.find(begin)
+    end_index = file_content.find(end)
+    if begin_index < 0:
+        raise ValueError(f"{file_path}: missing '{begin}'")
+    if end_index < 0:
+        raise ValueError(f"{file_path}: missing '{end}'")
+    if end_index < begin_index:
+        raise ValueError(f"{file_path}: '{end}' is before '{begin}'")
+
+    new_file_content = (
+        file_content[:begin_index]
+        + f"{begin}\n{content}\n{end}"
+        + file_content[end_index + len(end) :]
+    )
+    if new_file_content == file_content:
         return False
+    write_file(file_path, new_file_content)
+    return True
 
 
 # check if pre-commit hook tag exists on main README.md
 def is_hook_exists(hook_tag, md_file="README.md"):
-    exists = False
-    with open(md_file) as reader:
-        lines = reader.readlines()
-        for line in lines:
-            if hook_tag in line:
-                exists = True
-    return exists
-
-
-# Return title (first line) of README file
-def get_readme_title(readme_file):
-    with open(readme_file) as reader:
-        line = reader.readline()
-        return line
-
-
-# get first line of all README files inside specific path
-def get_readme_titles(path):
-    readme_titles = []
-    for readme_file in Path(path).rglob("README.md"):
-        path = str(readme_file)
-        # ignore README file if it has dot(.) in a path or the parent path does not contain any tf file
-        if ("/.") not in path and has_tf_files(readme_file.parent):
-            readme_title = get_readme_title(path)
-            if readme_title:
-                data = {"path": path, "title": readme_title}
-                readme_titles.append(data)
-    readme_titles.sort(key=lambda x: x["path"])
-    return readme_titles
-
-
-# get repository url
+    return hook_tag in find_markers(md_file, [hook_tag])
+
+
+# return (first line, markers of 'markers' found in the file). The file is scanned in chunks and the scan stops
+# as soon as the first line is read and all markers are found
+def scan_markdown(md_file, markers=()):
+    encoded_markers = {x: x.encode("utf-8") for x in markers}
+    overlap = max((len(x) for x in encoded_markers.values()), default=1) - 1
+    found = set()
+    title = b""
+    tail = b""
+    with open(md_file, "rb") as reader:
+        while True:
+            chunk = reader.read(SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            if b"\n" not in title:
+                title += chunk
+            data = tail + chunk
+            for marker, encoded_marker in encoded_markers.items():
+                if marker not in found and encoded_marker in data:
+                    found.add(marker)
+            if b"\n" in title and len(found) == len(encoded_markers):
+                break
+            tail = data[-overlap:] if overlap else b""
+    return decode_first_line(title), found
+
+
+# first line of a file content the same way as text mode 'readline' returns it
+def decode_first_line(content):
+    end = content.find(b"\n")
+    line = content if end < 0 else content[: end + 1]
+    return line.decode("utf-8").replace("\r\n", "\n")
+
+
+def find_markers(md_file, markers):
+    return scan_markdown(md_file, markers)[1]
+
+
+# find git directory of the repository containing 'path'. '.git' file of worktrees and submodules ('gitdir: ...') is followed.
+def get_git_dir(path="."):
+    if os.environ.get("GIT_DIR"):
+        return os.path.abspath(os.environ["GIT_DIR"])
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            with open(dot_git) as f:
+                content = f.read().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = content[len("gitdir:") :].strip()
+            return os.path.normpath(os.path.join(path, git_dir))
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+# config file of a git directory, worktrees use the config of the main repository ('commondir')
+def get_git_config_file(git_dir):
+    commondir_file = os.path.join(git_dir, "commondir")
+    if os.path.isfile(commondir_file):
+        with open(commondir_file) as f:
+            git_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return os.path.join(git_dir, "config")
+
+
+# parse git config value: quotes, escape sequences and comments ('#' or ';' outside of quotes)
+def parse_git_config_value(value):
+    result = ""
+    pending_space = ""
+    in_quotes = False
+    index = 0
+    while index < len(value):
+        c = value[index]
+        if c == "\\" and index + 1 < len(value):
+            index += 1
+            result += pending_space + {"n": "\n", "t": "\t", "b": "\b"}.get(
+                value[index], value[index]
+            )
+            pending_space = ""
+        elif c == '"':
+            in_quotes = not in_quotes
+        elif not in_quotes and c in "#;":
+            break
+        elif not in_quotes and c.isspace():
+            # whitespace is kept only between words
+            if result:
+                pending_space += c
+        else:
+            result += pending_space + c
+            pending_space = ""
+        index += 1
+    return result
+
+
+# return the last value of 'key' in section '[section "subsection"]' of a git config file (same as 'git config --get')
+def get_git_config_value(config_file, section, subsection, key):
+    value = None
+    current_section = None
+    with open(config_file) as f:
+        for line in f:
+            match = GIT_CONFIG_SECTION.match(line)
+            if match:
+                name, current_subsection = match.group(1).lower(), match.group(2)
+                if current_subsection is None and "." in name:
+                    # deprecated '[section.subsection]' syntax
+                    name, current_subsection = name.split(".", 1)
+                elif current_subsection is not None:
+                    current_subsection = re.sub(r"\\(.)", r"\1", current_subsection)
+                current_section = (name, current_subsection)
+                continue
+            if current_section != (section, subsection):
+                continue
+            match = GIT_CONFIG_KEY.match(line)
+            if match and match.group(1).lower() == key:
+                value = parse_git_config_value(match.group(2) or "")
+    return value
+
+
+# read 'remote.origin.url' from the repository config without starting git, return None if it is not found there
+def get_remote_origin_url():
+    git_dir = get_git_dir()
+    if git_dir is None:
+        return None
+    try:
+        return get_git_config_value(
+            get_git_config_file(git_dir), "remote", "origin", "url"
+        )
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+# get repository url, it is resolved once per process
+@functools.cache
 def get_module_url():
-    get_repository_url_command = "git config --get remote.origin.url"
-    proc = Popen(get_repository_url_command, stdout=PIPE, stderr=PIPE, shell=True)
-    output, error = proc.communicate()
-    full_url = output.decode("utf-8").strip()
-
-    if proc.returncode != 0:
-        print(error)
-        sys.exit(proc.returncode)
+    full_url = get_remote_origin_url()
+    # url can be defined outside of the repository config (e.g. global config or include), ask git
+    if not full_url:
+        get_repository_url_command = "git config --get remote.origin.url"
+        proc = Popen(get_repository_url_command, stdout=PIPE, stderr=PIPE, shell=True)
+        output, error = proc.communicate()
+        full_url = output.decode("utf-8").strip()
+
+        if proc.returncode != 0:
+            print(error)
+            sys.exit(proc.returncode)
 
     # urlparse can not be used for git urls
     if full_url.startswith("http"):
@@ -0,0 +1,440 @@
+import json
+import os
+import re
+
+# minimal HCL reader used by the hooks that only need the block structure of '*.tf' files (e.g. variables) and
+# do not want to pay for starting terraform-docs or terraform-config-inspect. Expressions are not evaluated,
+# their source text is kept as written. Only literal values (strings, numbers, bools, null, lists and objects)
+# can be converted to python values with 'literal_value'. Strings and heredocs are templates, templates without
+# references (e.g. escaped '$${x}' or '%{if true}x%{endif}') are rendered.
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+HEREDOC = re.compile(r"<<(-?)([A-Za-z_][A-Za-z0-9_-]*)[ \t]*\n")
+NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?")
+OPEN_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+CLOSE_BRACKETS = {")", "]", "}"}
+
+
+class HclError(Exception):
+    def __init__(self, message, line):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+# attribute 'name = expression', 'expression' is the source text of the expression
+class Attribute:
+    def __init__(self, name, expression, line):
+        self.name = name
+        self.expression = expression
+        self.line = line
+
+
+# block 'type "label" { ... }'
+class Block:
+    def __init__(self, type, labels, body, line):
+        self.type = type
+        self.labels = labels
+        self.body = body
+        self.line = line
+
+
+class Body:
+    def __init__(self):
+        self.attributes = {}
+        self.blocks = []
+
+    def blocks_of_type(self, type):
+        return [block for block in self.blocks if block.type == type]
+
+
+class Parser:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.line = 1
+
+    def error(self, message):
+        raise HclError(message, self.line)
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.text[index] if index < len(self.text) else ""
+
+    def advance(self, count=1):
+        end = min(self.pos + count, len(self.text))
+        self.line += self.text.count("\n", self.pos, end)
+        self.pos = end
+
+    # skip comment starting at the current position, return False if there is no comment
+    def skip_comment(self):
+        if self.peek() == "#" or self.text.startswith("//", self.pos):
+            end = self.text.find("\n", self.pos)
+            self.advance((end if end >= 0 else len(self.text)) - self.pos)
+            return True
+        if self.text.startswith("/*", self.pos):
+            end = self.text.find("*/", self.pos + 2)
+            if end < 0:
+                self.error("unterminated comment")
+            self.advance(end + 2 - self.pos)
+            return True
+        return False
+
+    # skip spaces and comments, newlines are skipped only if 'newlines' is True
+    def skip_space(self, newlines=True):
+        while self.pos < len(self.text):
+            c = self.peek()
+            if c in " \t\r" or (newlines and c == "\n"):
+                self.advance()
+            elif not self.skip_comment():
+                break
+
+    def read_identifier(self):
+        match = IDENTIFIER.match(self.text, self.pos)
+        if not match:
+            self.error(f"unexpected character {self.peek()!r}")
+        self.advance(match.end() - self.pos)
+        return match.group(0)
+
+    # skip quoted string (including template sequences '${ }' and '%{ }' which can contain nested strings)
+    def skip_string(self):
+        self.advance()
+        while self.pos < len(self.text):
+            c = self.peek()
+            if c == "\\":
+                self.advance(2)
+            elif c == '"':
+                self.advance()
+                return
+            elif c == "\n":
+                self.error("unterminated string")
+            elif c in "$%" and self.peek(1) == "{":
+                if self.peek(-1) == c:
+                    # escaped template sequence '$${' or '%%{'
+                    self.advance(2)
+                else:
+                    self.advance(2)
+                    self.skip_until_close("}")
+            else:
+                self.advance()
+        self.error("unterminated string")
+
+    def skip_heredoc(self, match):
+        self.advance(match.end() - self.pos)
+        marker = match.group(2)
+        while self.pos < len(self.text):
+            end = self.text.find("\n", self.pos)
+            end = end if end >= 0 else len(self.text)
+            line = self.text[self.pos : end]
+            self.advance(end - self.pos)
+            if line.strip() == marker:
+                return
+            self.advance()
+        self.error(f"unterminated heredoc {marker}")
+
+    # skip expression tokens until the closing bracket 'close' is consumed
+    def skip_until_close(self, close):
+        while self.pos < len(self.text):
+            self.skip_space()
+            c = self.peek()
+            if c == close:
+                self.advance()
+                return
+            self.skip_token()
+        self.error(f"missing {close!r}")
+
+    # skip one expression token (bracketed sequences are skipped as one token)
+    def skip_token(self):
+        c = self.peek()
+        if c == '"':
+            self.skip_string()
+        elif c in OPEN_BRACKETS:
+            self.advance()
+            self.skip_until_close(OPEN_BRACKETS[c])
+        elif c in CLOSE_BRACKETS:
+            self.error(f"unexpected {c!r}")
+        elif c == "<" and HEREDOC.match(self.text, self.pos):
+            self.skip_heredoc(HEREDOC.match(self.text, self.pos))
+        else:
+            self.advance()
+
+    # read expression until the end of the line (or until '}' of a single line block)
+    def read_expression(self):
+        start = self.pos
+        end = self.pos
+        while self.pos < len(self.text):
+            self.skip_space(newlines=False)
+            c = self.peek()
+            if c in ("\n", "}", ""):
+                break
+            self.skip_token()
+            end = self.pos
+        expression = self.text[start:end].strip()
+        if not expression:
+            self.error("missing expression")
+        return expression
+
+    def parse_body(self, closing=None):
+        body = Body()
+        while True:
+            self.skip_space()
+            c = self.peek()
+            if c == "":
+                if closing:
+                    self.error(f"missing {closing!r}")
+                return body
+            if c == closing:
+                self.advance()
+                return body
+
+            line = self.line
+            name = self.read_identifier()
+            self.skip_space(newlines=False)
+            if self.peek() == "=" and self.peek(1) != "=":
+                self.advance()
+                self.skip_space(newlines=False)
+                body.attributes[name] = Attribute(name, self.read_expression(), line)
+                continue
+
+            labels = []
+            while self.peek() != "{":
+                if self.peek() == '"':
+                    start = self.pos
+                    self.skip_string()
+                    labels.append(json.loads(self.text[start : self.pos]))
+                else:
+                    labels.append(self.read_identifier())
+                self.skip_space(newlines=False)
+            self.advance()
+            body.blocks.append(Block(name, labels, self.parse_body("}"), line))
+
+
+def parse(text):
+    return Parser(text).parse_body()
+
+
+# parse all '*.tf' files of a directory, return list of (file name, body) sorted by file name
+def parse_directory(path):
+    bodies = []
+    for file_name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, file_name)
+        if file_name.endswith(".tf") and os.path.isfile(file_path):
+            with open(file_path, encoding="utf-8") as f:
+                try:
+                    bodies.append((file_name, parse(f.read())))
+                except HclError as e:
+                    raise HclError(f"{file_path}: {e}", e.line) from e
+    return bodies
+
+
+# split template into parts ("literal", text), ("$", expression) of '${ }' and ("%", directive) of '%{ }'.
+# Escaped sequences ('$${' and '%%{') are literals, strip markers ('~') remove whitespace of the adjacent literals.
+# 'unescape' decodes escape sequences of literals (quoted strings only, heredocs have no escapes).
+def split_template(text, unescape):
+    parts = []
+    literal = []
+    strip_next = False
+    pos = 0
+    while pos < len(text):
+        if text.startswith(("$${", "%%{"), pos):
+            literal.append(text[pos] + "{")
+            pos += 3
+            continue
+        if not text.startswith(("${", "%{"), pos):
+            end = min(
+                (
+                    x
+                    for x in (text.find("$", pos + 1), text.find("%", pos + 1))
+                    if x > 0
+                ),
+                default=len(text),
+            )
+            literal.append(text[pos:end])
+            pos = end
+            continue
+
+        value = unescape("".join(literal))
+        parts.append(("literal", value.lstrip() if strip_next else value))
+        literal = []
+        parser = Parser(text)
+        parser.pos = pos + 2
+        try:
+            parser.skip_until_close("}")
+        except HclError as e:
+            raise ValueError(str(e)) from e
+        sequence = text[pos + 2 : parser.pos - 1]
+        if sequence.startswith("~"):
+            parts[-1] = ("literal", parts[-1][1].rstrip())
+        strip_next = sequence.endswith("~")
+        parts.append((text[pos], sequence.strip("~").strip()))
+        pos = parser.pos
+    value = unescape("".join(literal))
+    parts.append(("literal", value.lstrip() if strip_next else value))
+    return parts
+
+
+# string of an interpolated value ('${ }'), only literal strings, numbers and bools can be interpolated
+def template_string(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else repr(value)
+    raise ValueError("only strings, numbers and bools can be interpolated")
+
+
+# render template parts until one of the 'end_keywords' directives, return (text, index of the next part, keyword)
+def render_template(parts, index=0, end_keywords=()):
+    result = []
+    while index < len(parts):
+        kind, value = parts[index]
+        index += 1
+        if kind == "literal":
+            result.append(value)
+            continue
+        if kind == "$":
+            result.append(template_string(literal_value(value)))
+            continue
+
+        keyword, condition = (value.split(None, 1) + [""])[:2]
+        if keyword in end_keywords:
+            return "".join(result), index, keyword
+        if keyword != "if":
+            raise ValueError(f"'%{{{keyword}}}' directive is not a literal value")
+        then, index, end = render_template(parts, index, ("else", "endif"))
+        otherwise = ""
+        if end == "else":
+            otherwise, index, end = render_template(parts, index, ("endif",))
+        condition = literal_value(condition)
+        if not isinstance(condition, bool):
+            raise ValueError("condition of '%{if}' directive is not a bool")
+        result.append(then if condition else otherwise)
+    if end_keywords:
+        raise ValueError("missing '%{endif}' directive")
+    return "".join(result), index, None
+
+
+def unescape_string(text):
+    return json.loads(f'"{text}"')
+
+
+# remove common indentation of lines of '<<-' heredoc, lines with whitespaces only are not taken into account
+def dedent_heredoc(content):
+    lines = content.split("\n")
+    indents = [len(x) - len(x.lstrip(" \t")) for x in lines if x.strip(" \t")]
+    indent = min(indents, default=0)
+    return "\n".join(x[indent:] for x in lines)
+
+
+class LiteralParser(Parser):
+    def parse_value(self):
+        self.skip_space()
+        c = self.peek()
+        if c == '"':
+            start = self.pos
+            self.skip_string()
+            parts = split_template(self.text[start + 1 : self.pos - 1], unescape_string)
+            return render_template(parts)[0]
+        heredoc = HEREDOC.match(self.text, self.pos) if c == "<" else None
+        if heredoc:
+            self.skip_heredoc(heredoc)
+            # content ends with the new line before the line of the closing marker
+            end = self.text.rfind("\n", heredoc.end() - 1, self.pos) + 1
+            content = self.text[heredoc.end() : end]
+            if heredoc.group(1):
+                content = dedent_heredoc(content)
+            return render_template(split_template(content, lambda x: x))[0]
+        if c == "[":
+            return self.parse_sequence("]", list)
+        if c == "{":
+            return self.parse_sequence("}", dict)
+        match = NUMBER.match(self.text, self.pos)
+        if match:
+            self.advance(match.end() - self.pos)
+            return json.loads(match.group(0))
+        keyword = self.read_identifier()
+        if keyword in ("true", "false", "null"):
+            return json.loads(keyword)
+        raise ValueError(f"'{keyword}' is not a literal value")
+
+    # parse list '[a, b]' or object '{ a = b, "c" : d }'
+    def parse_sequence(self, close, kind):
+        self.advance()
+        values = kind()
+        while True:
+            self.skip_space()
+            if self.peek() == close:
+                self.advance()
+                return values
+            if kind is list:
+                values.append(self.parse_value())
+            else:
+                if self.peek() == '"':
+                    key = self.parse_value()
+                else:
+                    key = self.read_identifier()
+                self.skip_space()
+                if self.peek() not in ("=", ":"):
+                    raise ValueError("invalid object")
+                self.advance()
+                values[key] = self.parse_value()
+            self.skip_space()
+            if self.peek() == ",":
+                self.advance()
+
+
+# convert literal expression to a python value, raise ValueError if the expression is not a literal (e.g. it has references)
+def literal_value(expression):
+    parser = LiteralParser(expression)
+    try:
+        value = parser.parse_value()
+        parser.skip_space()
+    except HclError as e:
+        raise ValueError(str(e)) from e
+    if parser.pos != len(expression):
+        raise ValueError("expression is not a literal value")
+    return value
+
+
+# type of a variable without 'type' attribute is derived from its default value (same as terraform-docs does)
+def type_of_default(default_expression):
+    if default_expression is None:
+        return "any"
+    try:
+        value = literal_value(default_expression)
+    except ValueError:
+        # templates and heredocs with references are not literal values, but they are strings
+        if default_expression.startswith('"') or HEREDOC.match(default_expression):
+            return "string"
+        return "any"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, dict):
+        return "map"
+    if isinstance(value, list):
+        return "list"
+    return "any"
+
+
+# get input variables of a terraform directory in the same shape (and order) as 'terraform-docs --show inputs json'
+def get_inputs(path):
+    inputs = []
+    for _, body in parse_directory(path):
+        for block in body.blocks_of_type("variable"):
+            if not block.labels:
+                continue
+            type_attribute = block.body.attributes.get("type")
+            if type_attribute:
+                type = type_attribute.expression
+            else:
+                default_attribute = block.body.attributes.get("default")
+                type = type_of_default(
+                    default_attribute.expression if default_attribute else None
+                )
+            inputs.append({"name": block.labels[0], "type": type})
+    inputs.sort(key=lambda x: x["name"])
+    return inputs
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import shutil
+from subprocess import PIPE, Popen
+
+import terraformDocsUtils
+
+CACHE_NAME = "terraform-inputs"
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+TERRAFORM_DOCS_VERSIONS_FILE = "terraform-docs-versions.json"
+# config files terraform-docs loads automatically (relative to the module folder and to the current directory)
+TERRAFORM_DOCS_CONFIG_FILES = [
+    ".terraform-docs.yml",
+    ".terraform-docs.yaml",
+    ".config/.terraform-docs.yml",
+    ".config/.terraform-docs.yaml",
+]
+
+
+# get terraform-docs version. The version is stored per binary (path, size and mtime), so a warm cache does not start any subprocess
+def get_terraform_docs_version(cache_dir):
+    binary = shutil.which("terraform-docs")
+    if not binary:
+        return None
+    binary = os.path.realpath(binary)
+    stat = os.stat(binary)
+    binary_key = f"{binary}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    versions_file = os.path.join(cache_dir, TERRAFORM_DOCS_VERSIONS_FILE)
+    versions = {}
+    try:
+        with open(versions_file) as f:
+            versions = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if binary_key in versions:
+        return versions[binary_key]
+
+    proc = Popen([binary, "--version"], stdout=PIPE, stderr=PIPE)
+    output, error = proc.communicate()
+    if proc.returncode != 0:
+        return None
+    version = output.decode("utf-8").strip()
+
+    versions[binary_key] = version
+    try:
+        terraformDocsUtils.write_json(versions_file, versions)
+    except OSError:
+        pass
+    return version
+
+
+# return config files terraform-docs uses for the directory: 'config_file' if it is passed with '-c',
+# otherwise the existing config files terraform-docs loads automatically
+def get_config_files(path, config_file=None):
+    if config_file:
+        return [config_file]
+    return [
+        os.path.join(config_dir, x)
+        for config_dir in (path, os.getcwd())
+        for x in TERRAFORM_DOCS_CONFIG_FILES
+        if os.path.isfile(os.path.join(config_dir, x))
+    ]
+
+
+def update_digest(digest, name, file_path):
+    digest.update(b"\0" + name.encode("utf-8") + b"\0")
+    with open(file_path, "rb") as f:
+        digest.update(hashlib.sha256(f.read()).digest())
+
+
+# cache key is a hash of the terraform-docs version, the extractor (terraform-docs command the inputs are extracted with),
+# the name and content of every '*.tf' file of the directory and of the terraform-docs config files
+def get_cache_key(path, version, extractor="", config_files=()):
+    digest = hashlib.sha256(version.encode("utf-8"))
+    digest.update(b"\0" + extractor.encode("utf-8"))
+    for file_name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, file_name)
+        if file_name.endswith(".tf") and os.path.isfile(file_path):
+            update_digest(digest, file_name, file_path)
+    for config_file in config_files:
+        if os.path.isfile(config_file):
+            update_digest(digest, config_file, config_file)
+    return digest.hexdigest()
+
+
+# inputs are a list of {"name": ..., "type": ...}
+def is_valid_inputs(inputs):
+    return isinstance(inputs, list) and all(
+        isinstance(x, dict)
+        and isinstance(x.get("name"), str)
+        and isinstance(x.get("type"), str)
+        for x in inputs
+    )
+
+
+def load_inputs(cache_dir, key):
+    entry = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(entry) as f:
+            inputs = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # entry of another shape (e.g. edited by hand) is a cache miss, it is overwritten by the extracted inputs
+    if not is_valid_inputs(inputs):
+        return None
+    try:
+        # refresh entry mtime, mtime is used as the last access time for LRU eviction
+        os.utime(entry)
+    except OSError:
+        pass
+    return inputs
+
+
+def store_inputs(cache_dir, key, inputs):
+    try:
+        terraformDocsUtils.write_json(os.path.join(cache_dir, f"{key}.json"), inputs)
+        evict_entries(cache_dir)
+    except OSError:
+        pass
+
+
+# remove least recently used entries until the cache fits into CACHE_MAX_BYTES
+def evict_entries(cache_dir, max_bytes=CACHE_MAX_BYTES):
+    entries = []
+    total_size = 0
+    for entry in os.scandir(cache_dir):
+        if (
+            entry.is_file()
+            and entry.name.endswith(".json")
+            and entry.name != TERRAFORM_DOCS_VERSIONS_FILE
+        ):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+    for _, size, entry_path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+            total_size -= size
+        except OSError:
+            pass
+
+
+# return (inputs, True if inputs were loaded from the cache) of a terraform directory, run 'extract' only if the directory
+# was not seen before with the same '*.tf' content. 'extractor' identifies 'extract' (inputs of different extractors are
+# cached separately) and 'config_file' is the terraform-docs config file it passes with '-c' (if any)
+def get_inputs(path, extract, extractor, config_file=None):
+    try:
+        cache_dir = terraformDocsUtils.get_cache_dir(CACHE_NAME)
+        version = get_terraform_docs_version(cache_dir)
+    except OSError:
+        version = None
+
+    # cache can not be used (e.g. read-only home directory or missing terraform-docs binary)
+    if version is None:
+        return extract(path), False
+
+    config_files = get_config_files(path, config_file)
+    key = get_cache_key(path, version, extractor, config_files)
+    inputs = load_inputs(cache_dir, key)
+    if inputs is not None:
+        return inputs, True
+    inputs = extract(path)
+    store_inputs(cache_dir, key, inputs)
+    return inputs, False
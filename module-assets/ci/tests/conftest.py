@@ -0,0 +1,28 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# hook scripts import each other by module name, they are run from the 'ci' folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# '*.tf' files of fixtures are stored as '*.tf.txt', so terraform hooks of the repository (fmt, tflint) skip them
+FIXTURE_SUFFIX = ".txt"
+
+
+# return function which copies '*.tf' files of a fixture folder to a temporary module folder and returns its path
+@pytest.fixture
+def terraform_module(tmp_path):
+    def copy(fixture_dir):
+        path = tmp_path / os.path.basename(fixture_dir)
+        path.mkdir()
+        for file_name in os.listdir(fixture_dir):
+            if file_name.endswith(".tf" + FIXTURE_SUFFIX):
+                shutil.copyfile(
+                    os.path.join(fixture_dir, file_name),
+                    path / file_name[: -len(FIXTURE_SUFFIX)],
+                )
+        return str(path)
+
+    return copy
@@ -0,0 +1,101 @@
+import json
+import os
+
+import jsonSchemaValidator
+import pytest
+import terraformDocsUtils
+
+SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": {"type": "string", "minLength": 1}},
+}
+
+
+@pytest.fixture
+def schema_file(tmp_path, monkeypatch):
+    monkeypatch.setenv(terraformDocsUtils.CACHE_DIR_ENV, str(tmp_path / "cache"))
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps(SCHEMA))
+    return str(schema_file)
+
+
+def get_cache_files(tmp_path):
+    cache_dir = os.path.join(tmp_path, "cache", jsonSchemaValidator.CACHE_NAME)
+    return [os.path.join(cache_dir, x) for x in os.listdir(cache_dir)]
+
+
+def test_load_compiled_schema(tmp_path, schema_file):
+    compiled_schema = jsonSchemaValidator.load_compiled_schema(schema_file)
+    assert compiled_schema == jsonSchemaValidator.compile_schema(SCHEMA)
+    # second load is read from the cache
+    assert jsonSchemaValidator.load_compiled_schema(schema_file) == compiled_schema
+    assert len(get_cache_files(tmp_path)) == 1
+
+
+@pytest.mark.parametrize(
+    "cached",
+    [
+        [],
+        {"version": jsonSchemaValidator.COMPILER_VERSION},
+        {"version": "0", "rules": []},
+        {"version": jsonSchemaValidator.COMPILER_VERSION, "rules": [{"path": []}]},
+        {
+            "version": jsonSchemaValidator.COMPILER_VERSION,
+            "rules": [
+                {
+                    "path": [],
+                    "keyword": "type",
+                    "value": "object",
+                    "guards": [{"depth": 0, "negate": False}],
+                }
+            ],
+        },
+    ],
+)
+def test_load_compiled_schema_malformed_cache(tmp_path, schema_file, cached):
+    jsonSchemaValidator.load_compiled_schema(schema_file)
+    (cache_file,) = get_cache_files(tmp_path)
+    with open(cache_file, "w") as f:
+        json.dump(cached, f)
+
+    compiled_schema = jsonSchemaValidator.load_compiled_schema(schema_file)
+    assert compiled_schema == jsonSchemaValidator.compile_schema(SCHEMA)
+    prepared_schema = jsonSchemaValidator.prepare_schema(compiled_schema)
+    assert jsonSchemaValidator.validate(prepared_schema, {"name": ""}) == [
+        ("/name", "'' is too short")
+    ]
+    # cache entry is replaced by the compiled schema
+    with open(cache_file) as f:
+        assert json.load(f) == compiled_schema
+
+
+# document [1, "Name", "name"] fails the 'type' check of 1 and the 'pattern' check of "Name"
+@pytest.mark.parametrize(
+    "error_message, expected",
+    [
+        ("invalid name", ["invalid name", "invalid name"]),
+        (
+            {"pattern": "'${0}' is not lower case"},
+            ["1 is not of type string", "'Name' is not lower case"],
+        ),
+        (
+            {"type": "${0} is not a name"},
+            ["1 is not a name", "'Name' does not match '^[a-z]+$'"],
+        ),
+    ],
+)
+def test_error_message(error_message, expected):
+    schema = {
+        "type": "array",
+        "items": {
+            "type": "string",
+            "pattern": "^[a-z]+$",
+            "errorMessage": error_message,
+        },
+    }
+    prepared_schema = jsonSchemaValidator.prepare_schema(
+        jsonSchemaValidator.compile_schema(schema)
+    )
+    errors = jsonSchemaValidator.validate(prepared_schema, [1, "Name", "name"])
+    assert [message for _, message in errors] == expected
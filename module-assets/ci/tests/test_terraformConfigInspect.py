@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+import terraformConfigInspect
+
+KEY = "key"
+
+
+def write_entry(cache_dir, content):
+    with open(os.path.join(cache_dir, f"{KEY}.json"), "w") as f:
+        f.write(content)
+
+
+def test_load_provider_metadata_missing_entry(tmp_path):
+    assert terraformConfigInspect.load_provider_metadata(tmp_path, KEY) == (
+        False,
+        None,
+    )
+
+
+def test_load_provider_metadata_without_provider(tmp_path):
+    write_entry(tmp_path, json.dumps({"version": None}))
+    assert terraformConfigInspect.load_provider_metadata(tmp_path, KEY) == (True, None)
+
+
+def test_load_provider_metadata_cached(tmp_path):
+    write_entry(tmp_path, json.dumps({"version": "1.2.3"}))
+    metadata_file = terraformConfigInspect.get_metadata_file(tmp_path, "1.2.3")
+    # entry is a miss until the metadata file of the version exists
+    assert terraformConfigInspect.load_provider_metadata(tmp_path, KEY) == (
+        False,
+        None,
+    )
+    with open(metadata_file, "w") as f:
+        f.write("{}")
+    assert terraformConfigInspect.load_provider_metadata(tmp_path, KEY) == (
+        True,
+        metadata_file,
+    )
+
+
+@pytest.mark.parametrize(
+    "content", ["", "{", "[]", '"1.2.3"', "null", "{}", '{"version": 1}']
+)
+def test_load_provider_metadata_malformed_entry(tmp_path, content):
+    write_entry(tmp_path, content)
+    assert terraformConfigInspect.load_provider_metadata(tmp_path, KEY) == (
+        False,
+        None,
+    )
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+import terraformDocs
+
+ENTRY = {"module": "module-hash", "section": "section-hash"}
+
+
+def write_manifest(tmp_path, manifest):
+    manifest_file = tmp_path / "manifest.json"
+    manifest_file.write_text(json.dumps(manifest))
+    return str(manifest_file)
+
+
+def test_load_manifest(tmp_path):
+    manifest_file = write_manifest(
+        tmp_path,
+        {"version": terraformDocs.MANIFEST_VERSION, "modules": {"README.md": ENTRY}},
+    )
+    assert terraformDocs.load_manifest(manifest_file) == {"README.md": ENTRY}
+
+
+def test_load_manifest_missing_file(tmp_path):
+    assert terraformDocs.load_manifest(str(tmp_path / "manifest.json")) == {}
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        [],
+        "manifest",
+        None,
+        {"version": "0", "modules": {"README.md": ENTRY}},
+        {"version": terraformDocs.MANIFEST_VERSION},
+        {"version": terraformDocs.MANIFEST_VERSION, "modules": []},
+    ],
+)
+def test_load_manifest_malformed(tmp_path, manifest):
+    assert terraformDocs.load_manifest(write_manifest(tmp_path, manifest)) == {}
+
+
+# only malformed entries are dropped, the other entries are still used
+def test_load_manifest_malformed_entries(tmp_path):
+    modules = {
+        "README.md": ENTRY,
+        "a/README.md": [],
+        "b/README.md": {"module": "module-hash"},
+        "c/README.md": {"module": None, "section": "section-hash"},
+    }
+    manifest_file = write_manifest(
+        tmp_path, {"version": terraformDocs.MANIFEST_VERSION, "modules": modules}
+    )
+    assert terraformDocs.load_manifest(manifest_file) == {"README.md": ENTRY}
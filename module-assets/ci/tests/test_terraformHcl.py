@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+import terraformHcl
+
+# every fixture folder has '*.tf' files (stored as '*.tf.txt') and 'terraform-docs-inputs.json', the output of
+# 'terraform-docs --show inputs json <folder>' the parser must match
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "terraformHcl")
+FIXTURES = sorted(os.listdir(FIXTURES_DIR))
+
+
+def load_terraform_docs_inputs(fixture):
+    with open(os.path.join(FIXTURES_DIR, fixture, "terraform-docs-inputs.json")) as f:
+        return json.load(f)["inputs"]
+
+
+def get_variables(path):
+    return {
+        block.labels[0]: block.body
+        for _, body in terraformHcl.parse_directory(path)
+        for block in body.blocks_of_type("variable")
+    }
+
+
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_get_inputs_matches_terraform_docs(terraform_module, fixture):
+    path = terraform_module(os.path.join(FIXTURES_DIR, fixture))
+    expected = [
+        {"name": x["name"], "type": x["type"]}
+        for x in load_terraform_docs_inputs(fixture)
+    ]
+    assert terraformHcl.get_inputs(path) == expected
+
+
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_literal_values_match_terraform_docs(terraform_module, fixture):
+    variables = get_variables(terraform_module(os.path.join(FIXTURES_DIR, fixture)))
+    for tf_input in load_terraform_docs_inputs(fixture):
+        body = variables[tf_input["name"]]
+        assert ("default" not in body.attributes) == tf_input["required"]
+        for name in ("description", "default"):
+            if name not in body.attributes:
+                continue
+            value = terraformHcl.literal_value(body.attributes[name].expression)
+            assert value == tf_input[name]
+
+
+def test_line_numbers(terraform_module):
+    variables = get_variables(terraform_module(os.path.join(FIXTURES_DIR, "heredoc")))
+    assert [variables[x].attributes["type"].line for x in variables] == [2, 13, 18]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'variable "a" {',
+        'variable "a" {\n  default = "unterminated\n}',
+        'variable "a" {\n  description = <<EOT\ntext\n}',
+        "/* comment",
+    ],
+)
+def test_parse_errors(text):
+    with pytest.raises(terraformHcl.HclError):
+        terraformHcl.parse(text)
+
+
+# templates with references or directives other than '%{if}' are not literal values
+@pytest.mark.parametrize(
+    "expression",
+    [
+        '"${var.name}"',
+        '"%{for x in ["a"]}${x}%{endfor}"',
+        '"%{if var.enabled}a%{endif}"',
+        '"%{if true}a"',
+        '"${null}"',
+        "<<EOT\n${local.value}\nEOT",
+        "var.name",
+    ],
+)
+def test_literal_value_errors(expression):
+    with pytest.raises(ValueError):
+        terraformHcl.literal_value(expression)
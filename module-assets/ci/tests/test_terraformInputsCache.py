@@ -0,0 +1,68 @@
+import json
+
+import pytest
+import terraformDocsUtils
+import terraformInputsCache
+
+KEY = "key"
+INPUTS = [{"name": "region", "type": "string"}, {"name": "zones", "type": "number"}]
+
+
+def write_entry(cache_dir, inputs):
+    (cache_dir / f"{KEY}.json").write_text(json.dumps(inputs))
+
+
+def test_load_inputs(tmp_path):
+    write_entry(tmp_path, INPUTS)
+    assert terraformInputsCache.load_inputs(str(tmp_path), KEY) == INPUTS
+
+
+def test_load_inputs_missing_entry(tmp_path):
+    assert terraformInputsCache.load_inputs(str(tmp_path), KEY) is None
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        {"inputs": INPUTS},
+        "region",
+        None,
+        ["region"],
+        [{"name": "region"}],
+        [{"name": "region", "type": None}],
+        [{"name": 1, "type": "string"}],
+    ],
+)
+def test_load_inputs_malformed_entry(tmp_path, inputs):
+    write_entry(tmp_path, inputs)
+    assert terraformInputsCache.load_inputs(str(tmp_path), KEY) is None
+
+
+# malformed entry is replaced by the extracted inputs
+def test_get_inputs_malformed_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        terraformInputsCache, "get_terraform_docs_version", lambda x: "v0.19.0"
+    )
+    monkeypatch.setattr(
+        terraformDocsUtils,
+        "get_cache_dir",
+        lambda x: str(tmp_path / "cache"),
+    )
+    module_dir = tmp_path / "module"
+    module_dir.mkdir()
+    (module_dir / "variables.tf").write_text('variable "region" {}\n')
+    (tmp_path / "cache").mkdir()
+    key = terraformInputsCache.get_cache_key(str(module_dir), "v0.19.0", "extractor")
+    (tmp_path / "cache" / f"{key}.json").write_text('{"inputs": []}')
+
+    def extract(path):
+        return INPUTS
+
+    assert terraformInputsCache.get_inputs(str(module_dir), extract, "extractor") == (
+        INPUTS,
+        False,
+    )
+    assert terraformInputsCache.get_inputs(str(module_dir), extract, "extractor") == (
+        INPUTS,
+        True,
+    )
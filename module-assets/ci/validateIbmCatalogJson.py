@@ -1,85 +1,74 @@
+import argparse
 import json
 import os
 import pathlib
-import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import PIPE, Popen
 
+import jsonSchemaValidator
 import terraformDocsUtils
+import terraformHcl
+import terraformInputsCache
 
 IBM_CATALOG_FILE = "ibm_catalog.json"
 DA_FOLDER = "solutions"
-ERRORS = []
-
-
-def is_strict_version(version_str):
-    """
-    Returns True if the version string is strictly pinned to a version like '1.10.0'.
-    Rejects anything with comparison operators, ranges, or incomplete versions like '1.10'.
-    """
-    pattern = r"^\d+\.\d+\.\d+$"
-    return re.match(pattern, version_str.strip()) is not None
+INPUTS_ENGINES = ["terraform-docs", "native"]
+TERRAFORM_DOCS_INPUTS_COMMAND = "terraform-docs --show inputs json"
+IGNORED_DIRS = {".terraform", ".git"}
+OUTPUT_FORMATS = ["text", "json", "sarif"]
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SCHEMA_FILE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "ibmCatalogSchema.json"
+)
 
 
 # Find duplicates in array
 def find_duplicates(array):
-    n = len(array)
     duplicates = []
     # Create a set to store the unique elements
     unique = set()
     # Iterate through each element
-    for i in range(n):
+    for item in array:
         # If the element is already present, then add it to duplicates
         # Else insert the element into the set
-        if array[i] in unique:
-            duplicates.append(array[i])
+        if item in unique:
+            duplicates.append(item)
         else:
-            unique.add(array[i])
+            unique.add(item)
     return duplicates
 
 
-# Check for any error. If any error occurs, save it into global array and print it out at the end. We are checking if:
+# Check for any error and return list of errors of a flavor. We are checking if:
 # - DA's input variable is not defined in ibm_catalog.json
 # - ibm_catalog.json has extra (not needed) input variables
 # - any duplicates exists in ibm_catalog.json
-# - terraform_version is missing or not strictly defined
+# - flavor does not match the ibm_catalog.json schema (e.g. terraform_version is missing or not strictly defined, short_description is missing)
 # - input variables of type list(object), map or any do not have HCL editor defined in ibm_catalog.json
-# - short_description is missing
 def check_errors(
     inputs_not_in_catalog,
     inputs_not_in_da,
     duplicates,
-    working_directory,
-    flavor_label,
-    product_label,
-    terraform_version_error,
+    schema_errors,
     inputs_not_have_hcl_editor,
-    terraform_short_description_error,
 ):
-    error = False
     errors = []
     if len(inputs_not_in_catalog) > 0:
         errors.append(
-            f"- the following inputs should be defined in ibm_catalog.json: {inputs_not_in_catalog}"
+            f"the following inputs should be defined in ibm_catalog.json: {inputs_not_in_catalog}"
         )
-        error = True
     if len(inputs_not_in_da) > 0:
         errors.append(
-            f"- the following inputs should not be defined in ibm_catalog.json: {inputs_not_in_da}"
+            f"the following inputs should not be defined in ibm_catalog.json: {inputs_not_in_da}"
         )
-        error = True
     if len(duplicates) > 0:
-        errors.append(f"- ibm_catalog.json has duplicates: {duplicates}")
-        error = True
-    if terraform_version_error:
-        errors.append(terraform_version_error)
-        error = True
-    if terraform_short_description_error:
-        errors.append(terraform_short_description_error)
-        error = True
+        errors.append(f"ibm_catalog.json has duplicates: {duplicates}")
+    if len(schema_errors) > 0:
+        errors.extend(f"{pointer}: {message}" for pointer, message in schema_errors)
     if len(inputs_not_have_hcl_editor) > 0:
         errors.append(
-            f"- the following inputs should have HCL editor in ibm_catalog.json: {inputs_not_have_hcl_editor}"
+            f"the following inputs should have HCL editor in ibm_catalog.json: {inputs_not_have_hcl_editor}"
             f"\n\n******* HCL editor syntax is: *******\n\n"
             f'"custom_config": {{\n'
             f'  "type": "code_editor",\n'
@@ -90,42 +79,30 @@ def check_errors(
             f"  }}\n"
             f"}}"
         )
-        error = True
-    if error:
-        errors.insert(
-            0,
-            f"\nproduct_label: '{product_label}'\nflavor_label: '{flavor_label}'\nworking_directory: '{working_directory}':\n",
-        )
-        for val in errors:
-            ERRORS.append(val)
-    # if error is not thrown then check the JSON formatting
-    else:
-        # Read the JSON data
-        with open(IBM_CATALOG_FILE, encoding="utf-8") as f:
-            data = json.load(f)
+    return errors
 
-        # Write JSON with pretty formatting (indentation)
-        with open(IBM_CATALOG_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write("\n")  # Adds a single empty line at the end
 
+# Format ibm_catalog.json with pretty formatting (indentation). The file is written only if the formatted content differs,
+# so its mtime does not change when it is already formatted. With 'check_format' the file is never written, an error is returned instead.
+def format_catalog_file(catalog_file, ibm_catalog, content, check_format=False):
+    formatted_content = json.dumps(ibm_catalog, indent=2, ensure_ascii=False)
+    # Adds a single empty line at the end
+    formatted_content = (formatted_content + "\n").encode("utf-8")
+    if formatted_content == content:
+        return None
 
-# get inputs for solution defined in ibm_catalog.json file
-def check_ibm_catalog_file():
-    catalog_inputs = []
-    catalog_inputs_names = []
-
-    # read ibm_catalog.json content
-    with open(IBM_CATALOG_FILE) as f:
-        ibm_catalog = json.load(f)
+    if check_format:
+        return f"{catalog_file} is not formatted"
+    with open(catalog_file, "wb") as f:
+        f.write(formatted_content)
+    return None
 
-    # get repo name
-    path = pathlib.PurePath(terraformDocsUtils.get_module_url())
-    repo_name = path.name
 
-    # loop through flavors and check inputs for each solution defined in working_directory. Check only for "product_kind": "solution".
+# return (product, flavor, flavor JSON pointer) for every flavor of "product_kind": "solution" products
+def get_solution_flavors(ibm_catalog):
+    solution_flavors = []
     if ibm_catalog and "products" in ibm_catalog and ibm_catalog["products"]:
-        for product in ibm_catalog["products"]:
+        for product_index, product in enumerate(ibm_catalog["products"]):
             if (
                 "flavors" in product
                 and product["flavors"]
@@ -133,113 +110,361 @@ def check_ibm_catalog_file():
                 and product["product_kind"]
                 and product["product_kind"] == "solution"
             ):
-                product_label = ""
-                if "label" in product and product["label"]:
-                    product_label = product["label"]
-
-                for flavor in product["flavors"]:
-                    terraform_version_error = None
-                    terraform_short_description_error = None
-                    inputs_not_in_catalog = []
-                    inputs_not_in_da = []
-                    flavor_label = ""
-                    if "label" in flavor and flavor["label"]:
-                        flavor_label = flavor["label"]
-
-                    # if `working_directory` does not exist then default DA path to root
-                    if "working_directory" in flavor and flavor["working_directory"]:
-                        working_directory = flavor["working_directory"]
-                    else:
-                        working_directory = "./"
-
-                    da_path = f"{os.getcwd()}/{working_directory}"
-
-                    # if `working_directory` has a value of DA that does not exist, then add an error
-                    if not os.path.isdir(da_path):
-                        ERRORS.append(
-                            f"\nproduct_label: '{product_label}'\nflavor_label: '{flavor_label}'\nworking_directory: '{working_directory}':\n\n- solution does not exists"
-                        )
-                        continue
-
-                    # get input variable names of a solution
-                    da_inputs = get_inputs(da_path)
-                    da_inputs_names = [item["name"] for item in da_inputs]
-
-                    # get inputs defined in ibm_catalog.json for working_directory
-                    # inputs are needed for comparison with DA inputs
-                    catalog_inputs = []
-                    catalog_inputs_names = []
-                    if "configuration" in flavor and flavor["configuration"]:
-                        catalog_inputs = [
-                            {
-                                "name": x["key"],
-                                # check whether custom_config is defined and is of type code_editor
-                                "is_custom_config": (
-                                    isinstance(x.get("custom_config"), dict)
-                                    and x["custom_config"].get("type") == "code_editor"
-                                ),
-                                # include the whole custom_config for further checks
-                                "custom_config": x.get("custom_config", {}),
-                            }
-                            for x in flavor["configuration"]
-                            if not x.get("virtual", False)
-                        ]
-                        catalog_inputs_names = [item["name"] for item in catalog_inputs]
-
-                    # - repo does not have 'stack-' in the name
-                    if "stack-" not in repo_name:
-                        # compare input variables defined in a solution with the one's defined in ibm_catalog.json
-                        inputs_not_in_catalog = check_inputs_missing(
-                            da_inputs_names, catalog_inputs_names
-                        )
-                        inputs_not_in_da = check_inputs_extra(
-                            da_inputs_names, catalog_inputs_names
-                        )
-                        # if terraform_version is not defined inside flavor then add an error
-                        if not (
-                            "terraform_version" in flavor
-                            and flavor["terraform_version"]
-                        ):
-                            terraform_version_error = (
-                                "- key 'terraform_version' is missing"
-                            )
-                        elif not is_strict_version(flavor["terraform_version"]):
-                            version = flavor["terraform_version"]
-                            terraform_version_error = f"- key 'terraform_version': '{version}' not the right format. Should be locked to a version and have MAJOR.MINOR.PATCH format."
-
-                    # Find duplicates
-                    duplicates = find_duplicates(catalog_inputs_names)
-
-                    # check whether the HCL editor is used for input variables of type list(object) or map
-                    inputs_not_have_hcl_editor = check_hcl_editor(
-                        da_inputs, catalog_inputs
-                    )
-
-                    # check whether short_description is defined
-                    if not (
-                        "short_description" in flavor and flavor["short_description"]
-                    ):
-                        terraform_short_description_error = (
-                            "- key 'flavors.short_description' is missing"
-                        )
-
-                    check_errors(
-                        inputs_not_in_catalog,
-                        inputs_not_in_da,
-                        duplicates,
-                        working_directory,
-                        flavor_label,
-                        product_label,
-                        terraform_version_error,
-                        inputs_not_have_hcl_editor,
-                        terraform_short_description_error,
-                    )
-
-
-# get input variables for a solution
-def get_inputs(da_path):
+                for flavor_index, flavor in enumerate(product["flavors"]):
+                    pointer = f"/products/{product_index}/flavors/{flavor_index}"
+                    solution_flavors.append((product, flavor, pointer))
+    return solution_flavors
+
+
+# flavor is identified by product and flavor name (or label if name is not set)
+def get_flavor_key(product, flavor):
+    return (
+        product.get("name") or product.get("label"),
+        flavor.get("name") or flavor.get("label"),
+    )
+
+
+def run_git(command):
+    proc = Popen(command, stdout=PIPE, stderr=PIPE)
+    output, error = proc.communicate()
+
+    # hard fail if error occurs
+    if proc.returncode != 0:
+        print(f"Error running '{' '.join(command)}': {error.decode('utf-8')}")
+        sys.exit(proc.returncode)
+    return output.decode("utf-8")
+
+
+# return files changed since 'base_ref': committed, staged, unstaged and untracked files (relative to current directory)
+def get_changed_files(base_ref):
+    changed_files = run_git(["git", "diff", "--name-only", "--relative", base_ref])
+    untracked_files = run_git(["git", "ls-files", "--others", "--exclude-standard"])
+    return set(changed_files.splitlines()) | set(untracked_files.splitlines())
+
+
+# return ibm_catalog.json content at 'ref', or None if the file does not exist at 'ref'
+def get_base_catalog(catalog_file, ref):
+    command = ["git", "show", f"{ref}:./{catalog_file}"]
+    proc = Popen(command, stdout=PIPE, stderr=PIPE)
+    output, error = proc.communicate()
+    if proc.returncode != 0:
+        return None
+    try:
+        return json.loads(output)
+    except ValueError:
+        return None
+
+
+# return keys of flavors which entry in ibm_catalog.json differs from 'base_catalog' (or all flavors if there is no base)
+def get_changed_flavor_keys(ibm_catalog, base_catalog):
+    flavors = {
+        get_flavor_key(product, flavor): flavor
+        for product, flavor, _ in get_solution_flavors(ibm_catalog)
+    }
+    if base_catalog is None:
+        return set(flavors)
+    base_flavors = {
+        get_flavor_key(product, flavor): flavor
+        for product, flavor, _ in get_solution_flavors(base_catalog)
+    }
+    return {key for key, flavor in flavors.items() if base_flavors.get(key) != flavor}
+
+
+# incremental mode: return (directories with changed '*.tf' files, keys of changed flavors) for the changed files
+# passed by pre-commit and / or the files changed since 'base_ref'. All paths are relative to the current directory.
+def get_changes(catalog_file, ibm_catalog, changed_files, base_ref=None):
+    changed_tf_dirs = {
+        os.path.dirname(x) or "." for x in changed_files if x.endswith(".tf")
+    }
+
+    changed_flavor_keys = set()
+    if base_ref or os.path.normpath(catalog_file) in changed_files:
+        base_catalog = get_base_catalog(catalog_file, base_ref or "HEAD")
+        changed_flavor_keys = get_changed_flavor_keys(ibm_catalog, base_catalog)
+    return changed_tf_dirs, changed_flavor_keys
+
+
+# flavor is affected by a change if its own entry in ibm_catalog.json or '*.tf' files of its working_directory changed
+def is_flavor_affected(product, flavor, catalog_dir, working_directory, changes):
+    changed_tf_dirs, changed_flavor_keys = changes
+    return (
+        os.path.normpath(os.path.join(catalog_dir, working_directory))
+        in changed_tf_dirs
+        or get_flavor_key(product, flavor) in changed_flavor_keys
+    )
+
+
+# find all ibm_catalog.json files in a tree, '.terraform' and '.git' directories are skipped
+def find_catalog_files(root):
+    catalog_files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [x for x in dirnames if x not in IGNORED_DIRS]
+        if IBM_CATALOG_FILE in filenames:
+            catalog_file = os.path.normpath(os.path.join(dirpath, IBM_CATALOG_FILE))
+            catalog_files.append(catalog_file)
+    return sorted(catalog_files)
+
+
+# extract inputs of every distinct DA path once, running the extractions in a bounded worker pool ('executor')
+# return dictionary of DA path -> (inputs, inputs source, extraction wall time in seconds)
+def get_inputs_by_path(da_paths, executor, engine=INPUTS_ENGINES[0]):
+    unique_da_paths = list(dict.fromkeys(da_paths))
+    inputs = executor.map(lambda x: get_timed_inputs(x, engine), unique_da_paths)
+    return dict(zip(unique_da_paths, inputs, strict=True))
+
+
+def get_timed_inputs(da_path, engine=INPUTS_ENGINES[0]):
+    start = time.perf_counter()
+    inputs, source = get_inputs(da_path, engine)
+    return inputs, source, time.perf_counter() - start
+
+
+# validate ibm_catalog.json file. Return catalog result with errors and timings of every validated flavor:
+# {"catalog": str, "errors": [str], "format_error": str, "formatting_seconds": float, "flavors": [{
+#     "product_label": str, "flavor_label": str, "working_directory": str, "skipped": bool, "errors": [str],
+#     "inputs_source": "cache" | "subprocess" | "native", "input_extraction_seconds": float, "comparison_seconds": float}]}
+# Flavors sharing a DA path report the wall time of the one shared input extraction.
+def check_ibm_catalog_file(
+    catalog_file,
+    repo_name,
+    executor,
+    schema,
+    engine=INPUTS_ENGINES[0],
+    check_format=False,
+    changed_files=None,
+    base_ref=None,
+):
+    result = {"catalog": catalog_file, "errors": [], "flavors": []}
+    catalog_inputs = []
+    catalog_inputs_names = []
+    has_valid_flavor = False
+    catalog_dir = os.path.dirname(catalog_file)
+
+    # read ibm_catalog.json content
+    with open(catalog_file, "rb") as f:
+        content = f.read()
+    ibm_catalog = json.loads(content)
+
+    # in incremental mode only flavors affected by changed files are validated
+    changes = None
+    if changed_files or base_ref:
+        changes = get_changes(catalog_file, ibm_catalog, changed_files, base_ref)
+
+    # validate the whole catalog against the schema in one pass, errors of a flavor are reported with the flavor
+    flavor_pointers = {x[2] for x in get_solution_flavors(ibm_catalog)}
+    schema_errors_by_flavor = {}
+    for pointer, message in jsonSchemaValidator.validate(schema, ibm_catalog):
+        flavor_pointer = "/".join(pointer.split("/")[:5])
+        if flavor_pointer in flavor_pointers:
+            schema_errors_by_flavor.setdefault(flavor_pointer, []).append(
+                (pointer, message)
+            )
+        else:
+            result["errors"].append(f"{pointer}: {message}")
+
+    # resolve DA path of each flavor. Check only for "product_kind": "solution".
+    flavors = []
+    for product, flavor, flavor_pointer in get_solution_flavors(ibm_catalog):
+        product_label = ""
+        if "label" in product and product["label"]:
+            product_label = product["label"]
+
+        flavor_label = ""
+        if "label" in flavor and flavor["label"]:
+            flavor_label = flavor["label"]
+
+        # if `working_directory` does not exist then default DA path to root
+        if "working_directory" in flavor and flavor["working_directory"]:
+            working_directory = flavor["working_directory"]
+        else:
+            working_directory = "./"
+
+        flavor_result = {
+            "product_label": product_label,
+            "flavor_label": flavor_label,
+            "working_directory": working_directory,
+            "skipped": False,
+            "errors": [],
+            "inputs_source": None,
+            "input_extraction_seconds": 0.0,
+            "comparison_seconds": 0.0,
+        }
+        result["flavors"].append(flavor_result)
+
+        # not affected flavors were already validated, treat them as valid
+        if changes and not is_flavor_affected(
+            product, flavor, catalog_dir, working_directory, changes
+        ):
+            flavor_result["skipped"] = True
+            has_valid_flavor = True
+            continue
+
+        da_path = f"{os.path.abspath(catalog_dir)}/{working_directory}"
+        schema_errors = schema_errors_by_flavor.get(flavor_pointer, [])
+        flavors.append((flavor_result, flavor, schema_errors, da_path))
+
+    # get input variables of every solution. Flavors sharing the same DA path are extracted only once.
+    da_inputs_by_path = get_inputs_by_path(
+        [da_path for *_, da_path in flavors if os.path.isdir(da_path)],
+        executor,
+        engine,
+    )
+
+    # loop through flavors and check inputs for each solution defined in working_directory
+    for flavor_result, flavor, schema_errors, da_path in flavors:
+        inputs_not_in_catalog = []
+        inputs_not_in_da = []
+
+        # if `working_directory` has a value of DA that does not exist, then add an error
+        if not os.path.isdir(da_path):
+            flavor_result["errors"].append("solution does not exists")
+            continue
+
+        # get input variable names of a solution
+        da_inputs, inputs_source, extraction_seconds = da_inputs_by_path[da_path]
+        da_inputs_names = [item["name"] for item in da_inputs]
+        flavor_result["inputs_source"] = inputs_source
+        flavor_result["input_extraction_seconds"] = extraction_seconds
+        comparison_start = time.perf_counter()
+
+        # get inputs defined in ibm_catalog.json for working_directory
+        # inputs are needed for comparison with DA inputs
+        catalog_inputs = []
+        catalog_inputs_names = []
+        if "configuration" in flavor and flavor["configuration"]:
+            catalog_inputs = [
+                {
+                    "name": x["key"],
+                    # check whether custom_config is defined and is of type code_editor
+                    "is_custom_config": (
+                        isinstance(x.get("custom_config"), dict)
+                        and x["custom_config"].get("type") == "code_editor"
+                    ),
+                    # include the whole custom_config for further checks
+                    "custom_config": x.get("custom_config", {}),
+                }
+                for x in flavor["configuration"]
+                # configuration without 'key' is reported by the schema validation
+                if "key" in x and not x.get("virtual", False)
+            ]
+            catalog_inputs_names = [item["name"] for item in catalog_inputs]
+
+        # - repo does not have 'stack-' in the name
+        if "stack-" not in repo_name:
+            # compare input variables defined in a solution with the one's defined in ibm_catalog.json
+            inputs_not_in_catalog = check_inputs_missing(
+                da_inputs_names, catalog_inputs_names
+            )
+            inputs_not_in_da = check_inputs_extra(da_inputs_names, catalog_inputs_names)
+
+        # Find duplicates
+        duplicates = find_duplicates(catalog_inputs_names)
+
+        # check whether the HCL editor is used for input variables of type list(object) or map
+        inputs_not_have_hcl_editor = check_hcl_editor(da_inputs, catalog_inputs)
+
+        flavor_result["errors"] = check_errors(
+            inputs_not_in_catalog,
+            inputs_not_in_da,
+            duplicates,
+            schema_errors,
+            inputs_not_have_hcl_editor,
+        )
+        flavor_result["comparison_seconds"] = time.perf_counter() - comparison_start
+        has_valid_flavor = has_valid_flavor or not flavor_result["errors"]
+
+    # if error is not thrown for at least one flavor then check the JSON formatting (once per run)
+    result["format_error"] = None
+    result["formatting_seconds"] = 0.0
+    if has_valid_flavor:
+        formatting_start = time.perf_counter()
+        result["format_error"] = format_catalog_file(
+            catalog_file, ibm_catalog, content, check_format
+        )
+        result["formatting_seconds"] = time.perf_counter() - formatting_start
+    return result
+
+
+# return True if catalog result has any error
+def has_errors(result):
+    return bool(
+        result["errors"]
+        or result["format_error"]
+        or any(x["errors"] for x in result["flavors"])
+    )
+
+
+# validate ibm_catalog.json files concurrently, return list of catalog results (see check_ibm_catalog_file)
+def check_ibm_catalog_files(
+    catalog_files,
+    jobs=terraformDocsUtils.DEFAULT_JOBS,
+    engine=INPUTS_ENGINES[0],
+    check_format=False,
+    filenames=None,
+    base_ref=None,
+):
+    # get repo name
+    path = pathlib.PurePath(terraformDocsUtils.get_module_url())
+    repo_name = path.name
+
+    # compiled schema is cached on disk, it is compiled again only if the schema file changes
+    # terraform_version is not validated for stacks ('stack-' in repo name)
+    ignored_properties = {"terraform_version"} if "stack-" in repo_name else set()
+    schema = jsonSchemaValidator.prepare_schema(
+        jsonSchemaValidator.load_compiled_schema(SCHEMA_FILE), ignored_properties
+    )
+
+    # in incremental mode, get changed files once for all catalogs
+    changed_files = None
+    if filenames or base_ref:
+        changed_files = {os.path.normpath(x) for x in filenames or []}
+        if base_ref:
+            changed_files |= {os.path.normpath(x) for x in get_changed_files(base_ref)}
+
+    # catalogs and DA inputs extractions have separate pools, so a catalog waiting for its extractions never blocks them
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as inputs_executor:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as catalogs_executor:
+            results = catalogs_executor.map(
+                lambda x: check_ibm_catalog_file(
+                    x,
+                    repo_name,
+                    inputs_executor,
+                    schema,
+                    engine,
+                    check_format,
+                    changed_files,
+                    base_ref,
+                ),
+                catalog_files,
+            )
+            return list(results)
+
+
+# get input variables for a solution, return (inputs, inputs source). With 'terraform-docs' engine, terraform-docs
+# is run only if the solution's '*.tf' files are not cached yet
+def get_inputs(da_path, engine=INPUTS_ENGINES[0]):
+    if engine == "native":
+        return get_inputs_native(da_path), "native"
+    inputs, cached = terraformInputsCache.get_inputs(
+        da_path, get_inputs_with_tf_docs, TERRAFORM_DOCS_INPUTS_COMMAND
+    )
+    return inputs, "cache" if cached else "subprocess"
+
+
+# get input variables for a solution by parsing its '*.tf' files in-process
+def get_inputs_native(da_path):
+    try:
+        return terraformHcl.get_inputs(da_path)
+    except (OSError, terraformHcl.HclError) as e:
+        # hard fail if error occurs
+        print(f"Error getting inputs: {e}")
+        sys.exit(1)
+
+
+# get input variables for a solution using terraform-docs
+def get_inputs_with_tf_docs(da_path):
     inputs = []
-    command = f"terraform-docs --show inputs json {da_path}"
+    command = f"{TERRAFORM_DOCS_INPUTS_COMMAND} {da_path}"
     proc = Popen(command, stdout=PIPE, stderr=PIPE, shell=True)
     output, error = proc.communicate()
 
@@ -255,35 +480,31 @@ def get_inputs(da_path):
 
 # return inputs that are defined as solution (DA) input but are missing in ibm_catalog.json file
 def check_inputs_missing(da_inputs, catalog_inputs):
-    inputs_not_in_catalog = []
-    for da_input in da_inputs:
-        if da_input not in catalog_inputs:
-            inputs_not_in_catalog.append(da_input)
-    return inputs_not_in_catalog
+    catalog_inputs_index = set(catalog_inputs)
+    return [x for x in da_inputs if x not in catalog_inputs_index]
 
 
 # return inputs that are not defined as solution (DA) input but are added in ibm_catalog.json file
 def check_inputs_extra(da_inputs, catalog_inputs):
-    inputs_not_in_da = []
-    for catalog_input in catalog_inputs:
-        if catalog_input not in da_inputs:
-            inputs_not_in_da.append(catalog_input)
-    return inputs_not_in_da
+    da_inputs_index = set(da_inputs)
+    return [x for x in catalog_inputs if x not in da_inputs_index]
 
 
 # check whether the HCL editor is used for input variables of type list(object), map or any
 def check_hcl_editor(da_inputs, catalog_inputs):
     inputs_not_have_hcl_editor = []
+    # index catalog inputs by name, the first definition wins if the input is duplicated
+    catalog_inputs_index = {}
+    for item in catalog_inputs:
+        catalog_inputs_index.setdefault(item["name"], item)
+
     for da_input in da_inputs:
         if (
             da_input["type"].startswith("list(object")
             or da_input["type"].startswith("map")
             or da_input["type"] == "any"
         ):
-            catalog_input = next(
-                (item for item in catalog_inputs if item["name"] == da_input["name"]),
-                None,
-            )
+            catalog_input = catalog_inputs_index.get(da_input["name"])
             # check whether HCL editor is used
             # if custom_config is not defined or is_custom_config is False or supportedLanguages does not have hcl then add to inputs_not_have_hcl_editor
             if catalog_input and catalog_input["is_custom_config"]:
@@ -299,10 +520,178 @@ def check_hcl_editor(da_inputs, catalog_inputs):
     return inputs_not_have_hcl_editor
 
 
+# render results the way they were always printed: catalog errors, then errors of each flavor, then the formatting error
+def render_text(results, group_by_catalog=False):
+    lines = []
+    for result in results:
+        if not has_errors(result):
+            continue
+        # in monorepo mode errors are grouped per catalog
+        if group_by_catalog:
+            lines.append(f"\n{result['catalog']}:")
+        lines.extend(f"\n- {x}" for x in result["errors"])
+        for flavor in result["flavors"]:
+            if flavor["errors"]:
+                lines.append(
+                    f"\nproduct_label: '{flavor['product_label']}'\nflavor_label: '{flavor['flavor_label']}'\nworking_directory: '{flavor['working_directory']}':\n"
+                )
+                lines.extend(f"- {x}" for x in flavor["errors"])
+        if result["format_error"]:
+            lines.append(f"\n- {result['format_error']}")
+    return "\n".join(lines)
+
+
+def render_json(results):
+    return json.dumps(results, indent=2)
+
+
+# SARIF 2.1.0 log with one result per error, timings of every catalog and flavor are kept in 'properties'
+def render_sarif(results):
+    sarif_results = []
+    for result in results:
+        location = {
+            "physicalLocation": {"artifactLocation": {"uri": result["catalog"]}}
+        }
+        messages = [(x, None) for x in result["errors"]]
+        for flavor in result["flavors"]:
+            flavor_name = f"{flavor['product_label']}/{flavor['flavor_label']}"
+            messages.extend((x, flavor_name) for x in flavor["errors"])
+        if result["format_error"]:
+            messages.append((result["format_error"], None))
+
+        for message, flavor_name in messages:
+            sarif_location = dict(location)
+            if flavor_name is not None:
+                sarif_location["logicalLocations"] = [
+                    {"name": flavor_name, "kind": "flavor"}
+                ]
+            sarif_results.append(
+                {
+                    "ruleId": "ibm-catalog",
+                    "level": "error",
+                    "message": {"text": message},
+                    "locations": [sarif_location],
+                }
+            )
+
+    sarif = {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "validateIbmCatalogJson",
+                        "rules": [
+                            {
+                                "id": "ibm-catalog",
+                                "shortDescription": {
+                                    "text": "ibm_catalog.json is not valid"
+                                },
+                            }
+                        ],
+                    }
+                },
+                "results": sarif_results,
+                "properties": {"catalogs": results},
+            }
+        ],
+    }
+    return json.dumps(sarif, indent=2)
+
+
+def initialize_parser():
+    parser = argparse.ArgumentParser(description="Validate ibm_catalog.json file")
+    terraformDocsUtils.add_jobs_argument(parser, "DA inputs extracted")
+    parser.add_argument(
+        "--inputs-engine",
+        type=str,
+        action="store",
+        dest="inputs_engine",
+        choices=INPUTS_ENGINES,
+        help="Engine used to get DA inputs: 'terraform-docs' (default) runs terraform-docs, 'native' parses '*.tf' files in-process",
+        default=INPUTS_ENGINES[0],
+    )
+    parser.add_argument(
+        "--check-format",
+        action="store_true",
+        dest="check_format",
+        help="Report an error if ibm_catalog.json is not formatted instead of formatting it",
+        default=False,
+    )
+    parser.add_argument(
+        "--base-ref",
+        type=str,
+        action="store",
+        dest="base_ref",
+        help="Incremental mode: validate only flavors affected by changes since this git ref",
+        required=False,
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help="Incremental mode: validate only flavors affected by these changed files (e.g. passed by pre-commit)",
+    )
+    parser.add_argument(
+        "--all-catalogs",
+        action="store_true",
+        dest="all_catalogs",
+        help="Monorepo mode: validate every ibm_catalog.json found under the --root directory",
+        default=False,
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        action="store",
+        dest="root",
+        help="Directory searched for ibm_catalog.json files in monorepo mode (default: current directory)",
+        required=False,
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        action="store",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        help="Output format: 'text' (default), 'json' or 'sarif'. 'json' and 'sarif' include timings and inputs source of every flavor",
+        default=OUTPUT_FORMATS[0],
+    )
+    return parser
+
+
 if __name__ == "__main__":
-    if os.path.isfile(IBM_CATALOG_FILE):
-        check_ibm_catalog_file()
-        if len(ERRORS) > 0:
-            for error in ERRORS:
-                print(error)
+    parser = initialize_parser()
+    args = parser.parse_args()
+    if args.root and not args.all_catalogs:
+        parser.error("--root can be used only with --all-catalogs")
+    if args.all_catalogs:
+        root = args.root or "."
+        if not os.path.isdir(root):
+            print(f"Error: --root directory '{root}' does not exist")
+            sys.exit(1)
+        catalog_files = find_catalog_files(root)
+        if not catalog_files:
+            print(f"Error: no {IBM_CATALOG_FILE} found under '{root}'")
+            sys.exit(1)
+    elif os.path.isfile(IBM_CATALOG_FILE):
+        catalog_files = [IBM_CATALOG_FILE]
+    else:
+        catalog_files = []
+
+    if catalog_files:
+        results = check_ibm_catalog_files(
+            catalog_files,
+            args.jobs,
+            args.inputs_engine,
+            args.check_format,
+            args.filenames,
+            args.base_ref,
+        )
+        if args.output_format == "json":
+            print(render_json(results))
+        elif args.output_format == "sarif":
+            print(render_sarif(results))
+        elif any(has_errors(x) for x in results):
+            print(render_text(results, bool(args.all_catalogs)))
+        if any(has_errors(x) for x in results):
             sys.exit(1)
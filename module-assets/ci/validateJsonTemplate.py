@@ -1,56 +1,78 @@
+import argparse
 import json
 import os
 import re
 import sys
 from subprocess import PIPE, Popen
 
+import terraformHcl
+import terraformInputsCache
+
+INPUTS_ENGINES = ["terraform-docs", "native"]
+TERRAFORM_DOCS_CONFIG_FILE = (
+    "common-dev-assets/module-assets/.terraform-docs-config-validate-json-template.yaml"
+)
+TERRAFORM_DOCS_INPUTS_COMMAND = f"terraform-docs -c {TERRAFORM_DOCS_CONFIG_FILE}"
+# JSON strings (skipped) and "$_strings_" placeholders outside of strings, e.g. $PREFIX or ${PREFIX} in '"prefix": $PREFIX'
+TEMPLATE_TOKEN = re.compile(r'"(?:[^"\\\n]|\\.)*"?|\$(?:\{[^}"]*\}|[^\s,:{}\[\]"]*)')
+PLACEHOLDER_VALUE = '"temp_value"'
 validation_errors = []
 
 
-# create a new temp file from catalogValidationValues.json.template and replace "$_strings_"
-def create_temp_json(root, file):
-    temp_file = os.path.join(root, "temp_" + file.replace(".template", ""))
-    file_path = os.path.join(root, file)
-    with open(file_path) as fin:
-        with open(temp_file, "w") as fout:
-            for line in fin:
-                # it can happens that the content of catalogValidationValues.json.template is in one row only (not pretty print format), in that case we must split the line according the delimiter
-                multiple_lines = re.split("(,|{|})", line)
-                for each_line in multiple_lines:
-                    if "$" in each_line:
-                        temp_value = (
-                            '"temp_value",' if "," in each_line else '"temp_value"'
-                        )
-                        mytext = each_line[: each_line.rindex("$")] + temp_value
-                        fout.write(mytext)
-                    else:
-                        fout.write(each_line)
-    return temp_file
-
-
-# check if a file is valid JSON
-def is_json(myjson):
-    error = None
-    with open(myjson) as json_file:
-        try:
-            json.load(json_file)
-        except json.JSONDecodeError as e:
-            # read the JSON file content to get the lines for error printing
-            file = open(myjson)
-            content = file.readlines()
-
-            # construct error message
-            line_text = content[e.lineno - 1].replace("\n", "")
-            pointer_line = "-" * (e.colno - 1) + "^"
-            error = line_text + "\n" + pointer_line + "\n" + str(e)
+# replace "$_strings_" placeholders of a template with PLACEHOLDER_VALUE. Return the JSON text and list of
+# (position in JSON text, start and end position in template) of every replaced placeholder
+def substitute_placeholders(template):
+    parts = []
+    placeholders = []
+    last = 0
+    offset = 0
+    for match in TEMPLATE_TOKEN.finditer(template):
+        if match.group(0).startswith('"'):
+            continue
+        parts.append(template[last : match.start()])
+        parts.append(PLACEHOLDER_VALUE)
+        placeholders.append((match.start() + offset, match.start(), match.end()))
+        offset += len(PLACEHOLDER_VALUE) - (match.end() - match.start())
+        last = match.end()
+    parts.append(template[last:])
+    return "".join(parts), placeholders
+
+
+# map position of the JSON text back to the template (position inside a placeholder is mapped to its start)
+def get_template_position(position, placeholders):
+    template_position = position
+    for json_position, start, end in placeholders:
+        if json_position > position:
+            break
+        if position < json_position + len(PLACEHOLDER_VALUE):
+            return start
+        template_position = end + position - json_position - len(PLACEHOLDER_VALUE)
+    return template_position
+
+
+# parse catalogValidationValues.json.template in memory, return (template data, None) or (None, error message)
+# if the template (with substituted placeholders) is not valid JSON
+def load_template(file_path):
+    with open(file_path) as f:
+        template = f.read()
+    text, placeholders = substitute_placeholders(template)
+    try:
+        return json.loads(text), None
+    except json.JSONDecodeError as e:
+        error = json.JSONDecodeError(
+            e.msg, template, get_template_position(e.pos, placeholders)
+        )
 
-        return error
+    # construct error message, error line and column are the ones of the template
+    line_text = template.split("\n")[error.lineno - 1]
+    pointer_line = "-" * (error.colno - 1) + "^"
+    return None, line_text + "\n" + pointer_line + "\n" + str(error)
 
 
 # create 'temp_tf_inputs.json' file using terraform-docs to get all tf inputs
 def create_tf_input_json(root, output_file):
     # get tf inputs
-    command = f'terraform-docs -c common-dev-assets/module-assets/.terraform-docs-config-validate-json-template.yaml --output-file {output_file} "{root}" '
+    command = f'{TERRAFORM_DOCS_INPUTS_COMMAND} --output-file {output_file} "{root}" '
     proc = Popen(command, stdout=PIPE, stderr=PIPE, shell=True)
     proc.communicate()
 
@@ -60,20 +82,42 @@ def create_tf_input_json(root, output_file):
         sys.exit(proc.returncode)
 
 
-# get terraform inputs from '*.tf'
-def get_tf_inputs_with_tf_docs(root):
-    tf_inputs_name = []
+# get terraform inputs from '*.tf' using terraform-docs
+def extract_tf_inputs_with_tf_docs(root):
+    tf_inputs = []
     temp_tf_inputs_json_file = "temp_tf_inputs.json"
     create_tf_input_json(root, temp_tf_inputs_json_file)
 
     with open(os.path.join(root, temp_tf_inputs_json_file)) as json_data:
         data = json.load(json_data)
         for tf_input in data["inputs"]:
-            tf_inputs_name.append(tf_input["name"])
+            tf_inputs.append({"name": tf_input["name"], "type": tf_input["type"]})
 
     # remove temp temp_tf_inputs.json file
     os.remove(os.path.join(root, temp_tf_inputs_json_file))
-    return tf_inputs_name
+    return tf_inputs
+
+
+# get terraform inputs from '*.tf', terraform-docs is run only if the '*.tf' files are not cached yet
+def get_tf_inputs_with_tf_docs(root):
+    tf_inputs, _ = terraformInputsCache.get_inputs(
+        root,
+        extract_tf_inputs_with_tf_docs,
+        TERRAFORM_DOCS_INPUTS_COMMAND,
+        TERRAFORM_DOCS_CONFIG_FILE,
+    )
+    return [tf_input["name"] for tf_input in tf_inputs]
+
+
+# get terraform inputs from '*.tf' by parsing them in-process
+def get_tf_inputs_native(root):
+    try:
+        tf_inputs = terraformHcl.get_inputs(root)
+    except (OSError, terraformHcl.HclError) as e:
+        # hard fail if error occurs
+        print(f'Error getting "{root}" tf inputs: {e}.')
+        sys.exit(1)
+    return [tf_input["name"] for tf_input in tf_inputs]
 
 
 # get terraform inputs from 'stack_definition.json' file
@@ -88,15 +132,23 @@ def get_tf_inputs_from_stack_definition(root, stack_definition_json_file):
 
 
 # validate catalogValidationValues.json.template keys
-def validate_inputs(root, temp_catalog_template_file, original_catalog_template_file):
+def validate_inputs(
+    root,
+    catalog_template,
+    original_catalog_template_file,
+    engine=INPUTS_ENGINES[0],
+):
     # terraform inputs
     tf_inputs_name = []
     stack_definition_json_file = "stack_definition.json"
     is_stack = False
 
-    # if '*.tf' file exists then get the terraform inputs using terraform-docs
+    # if '*.tf' file exists then get the terraform inputs using terraform-docs (or in-process parser)
     if any(File.endswith(".tf") for File in os.listdir(root)):
-        tf_inputs_name = get_tf_inputs_with_tf_docs(root)
+        if engine == "native":
+            tf_inputs_name = get_tf_inputs_native(root)
+        else:
+            tf_inputs_name = get_tf_inputs_with_tf_docs(root)
     # if '*.tf' file does not exist then get the terraform inputs from 'stack_definition.json' file (Stack case)
     elif any(File == stack_definition_json_file for File in os.listdir(root)):
         is_stack = True
@@ -111,14 +163,8 @@ def validate_inputs(root, temp_catalog_template_file, original_catalog_template_
 
     # validate only if terraform inputs exist
     if tf_inputs_name:
-        # get catalog template keys
-        catalog_template_keys = []
-        with open(temp_catalog_template_file) as json_catalog_template_data:
-            data = json.load(json_catalog_template_data)
-            catalog_template_keys = data.keys()
-
         # check if catalog_template key is part of terraform input variables of the same directory
-        for catalog_template_key in catalog_template_keys:
+        for catalog_template_key in catalog_template.keys():
             # if 'ibmcloud_api_key' is defined in stack's json template then do not validate it
             if is_stack is True and catalog_template_key == "ibmcloud_api_key":
                 continue
@@ -129,18 +175,16 @@ def validate_inputs(root, temp_catalog_template_file, original_catalog_template_
                 )
 
 
-def main():
+def main(engine=INPUTS_ENGINES[0]):
     # find all 'catalogValidationValues.json.template' files in 'solutions' folder
     for root, dirs, files in os.walk("."):
         for file in files:
             if file.endswith("catalogValidationValues.json.template"):
                 if ".terraform" not in os.path.join(root, file):
-                    # create a new temp catalogValidationValues.json.template file
                     original_catalog_file = os.path.join(root, file)
-                    temp_catalog_file = create_temp_json(root, file)
+                    catalog_template, error = load_template(original_catalog_file)
 
                     # if catalogValidationValues.json.template is not valid JSON format then save the error
-                    error = is_json(temp_catalog_file)
                     if error is not None:
                         validation_errors.append(
                             original_catalog_file
@@ -149,11 +193,9 @@ def main():
                             + error
                         )
                     else:
-                        validate_inputs(root, temp_catalog_file, original_catalog_file)
-
-                    os.remove(
-                        temp_catalog_file
-                    )  # remove temp catalogValidationValues.json.template file
+                        validate_inputs(
+                            root, catalog_template, original_catalog_file, engine
+                        )
 
     # if any validation error occurs then print the error and fail the hook
     if validation_errors:
@@ -162,5 +204,22 @@ def main():
         sys.exit(1)
 
 
+def initialize_parser():
+    parser = argparse.ArgumentParser(
+        description="Validate catalogValidationValues.json.template files"
+    )
+    parser.add_argument(
+        "--inputs-engine",
+        type=str,
+        action="store",
+        dest="inputs_engine",
+        choices=INPUTS_ENGINES,
+        help="Engine used to get terraform inputs: 'terraform-docs' (default) runs terraform-docs, 'native' parses '*.tf' files in-process",
+        default=INPUTS_ENGINES[0],
+    )
+    return parser
+
+
 if __name__ == "__main__":
-    main()
+    args = initialize_parser().parse_args()
+    main(args.inputs_engine)